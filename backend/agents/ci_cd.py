@@ -55,6 +55,34 @@ Tasks:
 Respond with ONLY valid JSON."""
 
 
+# Static part of the fallback GitHub Actions workflow; only the name line varies.
+FALLBACK_WORKFLOW_BODY = """
+on:
+  push:
+    branches: [ main, develop ]
+  pull_request:
+    branches: [ main ]
+
+jobs:
+  build:
+    runs-on: ubuntu-latest
+    steps:
+      - uses: actions/checkout@v3
+      - name: Setup Node.js
+        uses: actions/setup-node@v3
+        with:
+          node-version: '18'
+      - name: Install dependencies
+        run: npm install
+      - name: Lint
+        run: npm run lint
+      - name: Run tests
+        run: npm test
+      - name: Build MTA
+        run: npm run build
+"""
+
+
 async def ci_cd_agent(state: BuilderState) -> BuilderState:
     """
     CI/CD Agent - GitHub Actions, MTA build, quality gates.
@@ -121,32 +149,7 @@ async def ci_cd_agent(state: BuilderState) -> BuilderState:
                 "quality_gates": ["lint", "test", "security-scan"],
                 "deployment_stages": ["dev", "staging", "production"]
             }
-            workflow_content = f"""name: CI/CD Pipeline - {project_name}
-
-on:
-  push:
-    branches: [ main, develop ]
-  pull_request:
-    branches: [ main ]
-
-jobs:
-  build:
-    runs-on: ubuntu-latest
-    steps:
-      - uses: actions/checkout@v3
-      - name: Setup Node.js
-        uses: actions/setup-node@v3
-        with:
-          node-version: '18'
-      - name: Install dependencies
-        run: npm install
-      - name: Lint
-        run: npm run lint
-      - name: Run tests
-        run: npm test
-      - name: Build MTA
-        run: npm run build
-"""
+            workflow_content = f"name: CI/CD Pipeline - {project_name}\n" + FALLBACK_WORKFLOW_BODY
         
         # Generate workflow file
         generated_files = [{
@@ -10,7 +10,8 @@ and inter-agent context passing.
 
 import json
 import logging
-from datetime import datetime
+import time
+from datetime import datetime, timezone
 from typing import Any
 
 from backend.agents.llm_providers import get_llm_manager
@@ -190,7 +191,8 @@ async def data_modeling_agent(state: BuilderState) -> BuilderState:
     """
     logger.info("Starting Data Modeling Agent (LLM-Driven)")
 
-    now = datetime.utcnow().isoformat()
+    started_at = time.perf_counter()
+    now = datetime.now(timezone.utc).isoformat()
     errors: list[ValidationError] = []
     generated_files: list[GeneratedFile] = []
 
@@ -259,62 +261,52 @@ async def data_modeling_agent(state: BuilderState) -> BuilderState:
         agent_name="data_modeling",
     )
 
-    if result and result.get("schema_cds"):
-        schema_content = result["schema_cds"]
+    schema_content = result.get("schema_cds") if result else None
 
-        # Basic validation: must contain namespace and entity keyword
-        if "entity" in schema_content.lower():
-            # Add common.cds if provided
-            if result.get("common_cds"):
-                generated_files.append({
-                    "path": "db/common.cds",
-                    "content": result["common_cds"],
-                    "file_type": "cds",
-                })
-                log_progress(state, "✅ Generated common.cds with reusable types.")
-
-            generated_files.append({
-                "path": "db/schema.cds",
-                "content": schema_content,
-                "file_type": "cds",
-            })
-            log_progress(state, "✅ Generated CDS schema.")
-
-            # Process sample data
-            sample_data = result.get("sample_data", [])
-            for sd in sample_data:
-                if sd.get("filename") and sd.get("content"):
-                    generated_files.append({
-                        "path": sd["filename"],
-                        "content": sd["content"],
-                        "file_type": "csv",
-                    })
-
-            if sample_data:
-                log_progress(state, f"✅ Generated {len(sample_data)} sample data files.")
-        else:
-            log_progress(state, "⚠️ LLM schema missing entity definitions. Adding minimal schema.")
-            schema_content = _generate_minimal_schema(entities, namespace, relationships)
+    # Basic validation: must contain namespace and entity keyword
+    if schema_content and "entity" in schema_content.lower():
+        # Add common.cds if provided
+        if result.get("common_cds"):
             generated_files.append({
-                "path": "db/schema.cds",
-                "content": schema_content,
+                "path": "db/common.cds",
+                "content": result["common_cds"],
                 "file_type": "cds",
             })
-    else:
-        # Minimal fallback — NOT a template, just the bare minimum to keep pipeline going
-        log_progress(state, "⚠️ LLM generation failed. Generating minimal valid schema.")
-        schema_content = _generate_minimal_schema(entities, namespace, relationships)
+            log_progress(state, "✅ Generated common.cds with reusable types.")
+
         generated_files.append({
             "path": "db/schema.cds",
             "content": schema_content,
             "file_type": "cds",
         })
-        errors.append({
-            "agent": "data_modeling",
-            "code": "LLM_FAILED",
-            "message": "LLM schema generation failed. Minimal schema generated.",
-            "field": None,
-            "severity": "warning",
+        log_progress(state, "✅ Generated CDS schema.")
+
+        # Process sample data
+        sample_files = [
+            {"path": sd["filename"], "content": sd["content"], "file_type": "csv"}
+            for sd in result.get("sample_data", [])
+            if sd.get("filename") and sd.get("content")
+        ]
+        if sample_files:
+            generated_files.extend(sample_files)
+            log_progress(state, f"✅ Generated {len(sample_files)} sample data files.")
+    else:
+        # Minimal fallback — NOT a template, just the bare minimum to keep pipeline going
+        if schema_content:
+            log_progress(state, "⚠️ LLM schema missing entity definitions. Adding minimal schema.")
+        else:
+            log_progress(state, "⚠️ LLM generation failed. Generating minimal valid schema.")
+            errors.append({
+                "agent": "data_modeling",
+                "code": "LLM_FAILED",
+                "message": "LLM schema generation failed. Minimal schema generated.",
+                "field": None,
+                "severity": "warning",
+            })
+        generated_files.append({
+            "path": "db/schema.cds",
+            "content": _generate_minimal_schema(entities, namespace, relationships),
+            "file_type": "cds",
         })
 
     # ==========================================================================
@@ -347,8 +339,8 @@ async def data_modeling_agent(state: BuilderState) -> BuilderState:
         "agent_name": "data_modeling",
         "status": "completed",
         "started_at": now,
-        "completed_at": datetime.utcnow().isoformat(),
-        "duration_ms": None,
+        "completed_at": datetime.now(timezone.utc).isoformat(),
+        "duration_ms": int((time.perf_counter() - started_at) * 1000),
         "error": None,
         "logs": state.get("current_logs", []),
     }]
@@ -361,6 +353,14 @@ async def data_modeling_agent(state: BuilderState) -> BuilderState:
 # Minimal Fallback (NOT a template — bare minimum valid CDS)
 # =============================================================================
 
+# CDS types that take parameters, keyed by type name. Each formatter receives
+# the field definition so defaults are applied in one place.
+_CDS_TYPE_FORMATTERS = {
+    "String": lambda field: f"String({field.get('length', 100)})",
+    "Decimal": lambda field: f"Decimal({field.get('precision', 12)},{field.get('scale', 2)})",
+}
+
+
 def _generate_minimal_schema(
     entities: list[EntityDefinition],
     namespace: str,
@@ -371,12 +371,14 @@ def _generate_minimal_schema(
     This is NOT a template — it's a structured conversion of the entity
     data that the LLM already generated in the requirements phase.
     """
-    lines = [
-        f"namespace {namespace};",
-        "",
-        "using { cuid, managed } from '@sap/cds/common';",
-        "",
-    ]
+    # Resolve each entity's aspects once; the union drives the common import
+    entity_aspects = [entity.get("aspects") or ["cuid", "managed"] for entity in entities]
+    all_aspects = {aspect for aspects in entity_aspects for aspect in aspects}
+    using_aspects = [a for a in ("cuid", "managed", "temporal") if a in all_aspects]
+
+    lines = [f"namespace {namespace};", ""]
+    if using_aspects:
+        lines.extend((f"using {{ {', '.join(using_aspects)} }} from '@sap/cds/common';", ""))
 
     # Build relationship lookup
     compositions = {}
@@ -384,63 +386,51 @@ def _generate_minimal_schema(
     for rel in relationships:
         source = rel.get("source_entity", "")
         target = rel.get("target_entity", "")
-        name = rel.get("name", target[0].lower() + target[1:] if target else "ref")
-        rel_type = rel.get("type", "association")
-        cardinality = rel.get("cardinality", "n:1")
+        name = rel.get("name") or (target[0].lower() + target[1:] if target else "ref")
 
-        if rel_type == "composition":
+        if rel.get("type", "association") == "composition":
             compositions.setdefault(source, []).append((name, target))
         else:
-            associations.setdefault(source, []).append((name, target, cardinality))
+            associations.setdefault(source, []).append((name, target, rel.get("cardinality", "n:1")))
 
-    for entity in entities:
+    for entity, aspects in zip(entities, entity_aspects):
         name = entity.get("name", "Entity")
         desc = entity.get("description", "")
         fields = entity.get("fields", [])
-        aspects = entity.get("aspects", ["cuid", "managed"])
 
         # Entity declaration
-        aspect_str = ", ".join(aspects) if aspects else "cuid, managed"
+        aspect_str = ", ".join(aspects)
         if desc:
-            lines.append(f"/**")
-            lines.append(f" * {desc}")
-            lines.append(f" */")
+            lines.extend(("/**", f" * {desc}", " */"))
         lines.append(f"entity {name} : {aspect_str} {{")
 
         # Fields (skip ID since cuid provides it)
         for field in fields:
             fname = field.get("name", "")
-            ftype = field.get("type", "String")
             if fname == "ID":
                 continue  # cuid provides this
 
+            ftype = field.get("type", "String")
+            nullable = field.get("nullable", True)
+            is_key = field.get("key", False)
+            default_val = field.get("default")
+            title = field.get("annotations", {}).get("title", "")
+
             # Build type string
-            type_str = ftype
-            if ftype == "String":
-                length = field.get("length", 100)
-                type_str = f"String({length})"
-            elif ftype == "Decimal":
-                precision = field.get("precision", 12)
-                scale = field.get("scale", 2)
-                type_str = f"Decimal({precision},{scale})"
+            format_type = _CDS_TYPE_FORMATTERS.get(ftype)
+            type_str = format_type(field) if format_type else ftype
 
             # Annotations
-            annotations = []
-            field_annotations = field.get("annotations", {})
-            title = field_annotations.get("title", "")
-            if title:
-                annotations.append(f"@title: '{title}'")
-
-            if not field.get("nullable", True) and not field.get("key", False):
-                annotations.append("@mandatory")
+            ann_str = " ".join(ann for ann in (
+                f"@title: '{title}'" if title else "",
+                "@mandatory" if not nullable and not is_key else "",
+            ) if ann)
 
             # Default
             default_str = ""
-            default_val = field.get("default")
             if default_val is not None:
                 default_str = f" default {default_val}"
 
-            ann_str = " ".join(annotations)
             if ann_str:
                 ann_str = "  " + ann_str
             lines.append(f"  {fname} : {type_str}{ann_str}{default_str};")
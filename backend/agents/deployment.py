@@ -7,22 +7,38 @@ CI/CD pipelines, and BTP deployment artifacts.
 FULLY LLM-DRIVEN with inter-agent context.
 """
 
+import asyncio
 import json
 import logging
-from datetime import datetime
+import time
+from datetime import datetime, timezone
+from string import Template
+from typing import Any
 
 from backend.agents.llm_utils import (
     generate_with_retry,
     get_full_context,
+    json_dumps_indented,
+    merge_artifacts,
 )
 from backend.agents.knowledge_loader import get_security_knowledge
+from backend.agents.llm_cache import (
+    get_llm_cache,
+    normalize_placeholders,
+    restore_placeholders,
+    structural_entry,
+)
 from backend.agents.state import (
+    ArtifactSpec,
+    AuthType,
     BuilderState,
+    DatabaseType,
     GeneratedFile,
     DeploymentTarget,
     ValidationError,
 )
-from backend.agents.progress import log_progress
+from backend.agents.progress import ProgressBuffer, log_progress
+from backend.config import get_settings
 
 logger = logging.getLogger(__name__)
 
@@ -62,16 +78,11 @@ OUTPUT FORMAT:
 Return ONLY valid JSON."""
 
 
-DEPLOYMENT_PROMPT = """Generate deployment configs for this SAP CAP application.
-
-Project: {project_name}
-Namespace: {namespace}
-Deployment Target: {deployment_target}
-
-{context}
-
-ENTITIES:
-{entities_json}
+# Static instructions come first so providers with prefix caching can reuse
+# them across projects; only DEPLOYMENT_PROMPT_SUFFIX varies per run. The
+# suffix is a string.Template, so braces in the substituted JSON/context
+# and in future example snippets need no escaping.
+DEPLOYMENT_PROMPT_PREFIX = """Generate deployment configs for this SAP CAP application.
 
 Generate:
 1. mta.yaml — Full MTA descriptor with all modules/resources
@@ -81,66 +92,169 @@ Generate:
 5. README.md — Project-specific setup guide
 6. .gitignore — Proper ignore patterns for CAP
 7. .eslintrc.json — ESLint config
-8. .prettierrc.json — Prettier config
+8. .prettierrc.json — Prettier config"""
+
+
+DEPLOYMENT_PROMPT_SUFFIX = Template("""Project: $project_name
+MTA ID: $mta_id
+Namespace: $namespace
+Deployment Target: $deployment_target
 
-Respond with ONLY valid JSON."""
+$context
+
+ENTITIES:
+$entities_json
+
+Respond with ONLY valid JSON.""")
+
+
+_MTA_ID_TRANSLATION = str.maketrans({" ": "-", "_": "-"})
+
+# LLM response key -> artifact target
+DEPLOYMENT_FILE_MAP = {
+    "mta_yaml": ArtifactSpec("mta.yaml", "yaml"),
+    "package_json": ArtifactSpec("package.json", "json"),
+    "npmrc": ArtifactSpec(".npmrc", "config"),
+    "env_sample": ArtifactSpec(".env.sample", "config"),
+    "readme_md": ArtifactSpec("README.md", "markdown"),
+    "gitignore": ArtifactSpec(".gitignore", "config"),
+    "eslintrc_json": ArtifactSpec(".eslintrc.json", "json"),
+    "prettierrc_json": ArtifactSpec(".prettierrc.json", "json"),
+    "piper_config_yml": ArtifactSpec(".pipeline/config.yml", "yaml"),
+}
 
 
 async def deployment_agent(state: BuilderState) -> BuilderState:
     """Deployment Configuration Agent (LLM-Driven)"""
     logger.info("Starting Deployment Agent (LLM-Driven)")
 
-    now = datetime.utcnow().isoformat()
+    started_at = time.perf_counter()
+    now = datetime.now(timezone.utc).isoformat()
     errors: list[ValidationError] = []
     generated_files: list[GeneratedFile] = []
 
     state["current_agent"] = "deployment"
     state["updated_at"] = now
     state["current_logs"] = []
-    log_progress(state, "Starting deployment phase...")
+    # Status lines are batched into one event per burst; the buffer is
+    # flushed before the LLM call so the frontend is not left waiting
+    progress = ProgressBuffer(state)
+    progress.add("Starting deployment phase...")
 
     project_name = state.get("project_name", "App")
     namespace = state.get("project_namespace", "com.company.app")
     deployment_target = state.get("deployment_target", DeploymentTarget.CF.value)
     entities = state.get("entities", [])
+    # Canonical id for the MTA descriptor and package name, derived once
+    mta_id = project_name.lower().translate(_MTA_ID_TRANSLATION)
     context = get_full_context(state)
     knowledge = get_security_knowledge()  # security_and_deployment reference
 
-    prompt = DEPLOYMENT_PROMPT.format(
+    entities_json = json_dumps_indented(entities)
+    prompt = DEPLOYMENT_PROMPT_SUFFIX.substitute(
         project_name=project_name,
+        mta_id=mta_id,
         namespace=namespace,
         deployment_target=deployment_target,
         context=context or "(no prior context)",
-        entities_json=json.dumps(entities, indent=2),
+        entities_json=entities_json,
     )
 
-    # Inject knowledge into prompt
-    prompt = f"{knowledge}\n\n{prompt}"
-
-    log_progress(state, "Calling LLM for deployment configuration...")
-
-    result = await generate_with_retry(
-        prompt=prompt,
-        system_prompt=DEPLOYMENT_SYSTEM_PROMPT,
-        state=state,
-        required_keys=["package_json"],
-        max_retries=3,
-        agent_name="deployment",
+    # Knowledge and instructions are the same for every project; keep them
+    # ahead of the project-specific part
+    prompt = f"{knowledge}\n\n{DEPLOYMENT_PROMPT_PREFIX}\n\n{prompt}"
+
+    cache = get_llm_cache()
+    cache_inputs = {
+        "provider": state.get("llm_provider"),
+        "model": state.get("llm_model"),
+        "complexity": state.get("complexity_level"),
+    }
+    placeholders = {
+        "__NAME__": project_name,
+        "__MTAID__": mta_id,
+        "__NS__": namespace,
+    }
+    # Structural reuse across projects is only safe when the project values
+    # cannot be confused with text that every project shares
+    shared_text = f"{knowledge}{DEPLOYMENT_SYSTEM_PROMPT}{DEPLOYMENT_PROMPT_PREFIX}{entities_json}"
+    structural = all(len(v) >= 4 and v not in shared_text for v in placeholders.values())
+
+    # Small projects on the standard setup (SQLite/HANA, mock/XSUAA auth,
+    # local or Cloud Foundry target) get a complete descriptor set from
+    # _template_deployment, so the LLM round trip can be skipped (opt-in)
+    template_max_entities = get_settings().deployment_template_max_entities
+    use_template = (
+        0 < len(entities) <= template_max_entities
+        and state.get("auth_type", AuthType.MOCK.value) in (AuthType.MOCK.value, AuthType.XSUAA.value)
+        and state.get("database_type", DatabaseType.SQLITE.value) in (DatabaseType.SQLITE.value, DatabaseType.HANA.value)
+        and deployment_target in (DeploymentTarget.LOCAL.value, DeploymentTarget.CF.value)
+        and not state.get("integrations_cd_requires")
     )
 
+    result = None
+    if cache and not use_template:
+        cache_key = cache.make_key("deployment", {"prompt": prompt, **cache_inputs})
+        structural_key = cache.make_key("deployment:structural", {
+            "prompt": normalize_placeholders(prompt, placeholders),
+            **cache_inputs,
+        }) if structural else None
+
+        # Exact hit first, then a near-duplicate project with other names
+        result = await cache.aget(cache_key)
+        if not result and structural_key:
+            cached = await cache.aget(structural_key)
+            if cached:
+                result = restore_placeholders(cached, placeholders)
+
+    if use_template:
+        progress.add(f"Simple project ({len(entities)} entities). Using deployment template without LLM call.")
+    elif result:
+        progress.add("♻️ Reusing cached deployment configuration.")
+    else:
+        # Prepare the template fallback alongside the LLM call so a failed
+        # generation does not add its own latency on top of the retries.
+        fallback_task = asyncio.create_task(
+            asyncio.to_thread(_minimal_deployment, project_name, mta_id)
+        )
+
+        progress.add("Calling LLM for deployment configuration...")
+        progress.flush()
+
+        def _report_file(key: str, value: Any) -> None:
+            # Surface each file as soon as the streamed response completes it
+            if value and key in DEPLOYMENT_FILE_MAP:
+                log_progress(state, f"Received {DEPLOYMENT_FILE_MAP[key].path} from LLM.")
+
+        try:
+            result = await generate_with_retry(
+                prompt=prompt,
+                system_prompt=DEPLOYMENT_SYSTEM_PROMPT,
+                state=state,
+                required_keys=["package_json"],
+                max_retries=3,
+                agent_name="deployment",
+                cache_system_prompt=True,
+                on_item=_report_file,
+                # Deterministic output: config files need no variety, and repeat
+                # runs stay consistent with the response cache
+                temperature=0.0,
+            )
+            fallback_files = None if result else await fallback_task
+        finally:
+            # Drop the fallback when the LLM output was used or the agent is
+            # cancelled mid-call (no-op if awaited above)
+            fallback_task.cancel()
+
+        if result:
+            if cache:
+                await cache.aset(cache_key, result)
+                entry = structural_entry(result, placeholders) if structural_key else None
+                if entry is not None:
+                    await cache.aset(structural_key, entry)
+
     if result:
-        file_map = {
-            "mta_yaml": ("mta.yaml", "yaml"),
-            "package_json": ("package.json", "json"),
-            "npmrc": (".npmrc", "config"),
-            "env_sample": (".env.sample", "config"),
-            "readme_md": ("README.md", "markdown"),
-            "gitignore": (".gitignore", "config"),
-            "eslintrc_json": (".eslintrc.json", "json"),
-            "prettierrc_json": (".prettierrc.json", "json"),
-            "piper_config_yml": (".pipeline/config.yml", "yaml"),
-        }
-        for key, (path, file_type) in file_map.items():
+        for key, (path, file_type) in DEPLOYMENT_FILE_MAP.items():
             content = result.get(key, "")
             if content:
                 if key == "package_json" and state.get("integrations_cd_requires"):
@@ -156,10 +270,14 @@ async def deployment_agent(state: BuilderState) -> BuilderState:
                         logger.warning(f"Failed to inject integrations into package.json: {e}")
                 generated_files.append({"path": path, "content": content, "file_type": file_type})
 
-        log_progress(state, f"✅ Generated {len(generated_files)} deployment files.")
+        progress.add(f"✅ Generated {len(generated_files)} deployment files.")
+    elif use_template:
+        generated_files.extend(_template_deployment(
+            project_name, mta_id, state.get("database_type", DatabaseType.SQLITE.value),
+        ))
     else:
-        log_progress(state, "⚠️ LLM failed. Generating minimal deployment config.")
-        generated_files.extend(_minimal_deployment(project_name, namespace))
+        progress.add("⚠️ LLM failed. Generating minimal deployment config.")
+        generated_files.extend(fallback_files)
         errors.append({
             "agent": "deployment",
             "code": "LLM_FAILED",
@@ -168,8 +286,7 @@ async def deployment_agent(state: BuilderState) -> BuilderState:
             "severity": "warning",
         })
 
-    existing = state.get("artifacts_deployment", [])
-    state["artifacts_deployment"] = existing + generated_files
+    state["artifacts_deployment"] = merge_artifacts(state.get("artifacts_deployment", []), generated_files)
     state["validation_errors"] = state.get("validation_errors", []) + errors
     state["needs_correction"] = False
 
@@ -177,20 +294,21 @@ async def deployment_agent(state: BuilderState) -> BuilderState:
         "agent_name": "deployment",
         "status": "completed",
         "started_at": now,
-        "completed_at": datetime.utcnow().isoformat(),
-        "duration_ms": None,
+        "completed_at": datetime.now(timezone.utc).isoformat(),
+        "duration_ms": int((time.perf_counter() - started_at) * 1000),
         "error": None,
         "logs": state.get("current_logs", []),
     }]
 
-    log_progress(state, f"Deployment complete. Generated {len(generated_files)} files.")
+    progress.add(f"Deployment complete. Generated {len(generated_files)} files.")
+    progress.flush()
     return state
 
 
-def _minimal_deployment(project_name, namespace):
+def _minimal_deployment(project_name, mta_id):
     """Minimal deployment files."""
     pkg = json.dumps({
-        "name": project_name.lower().replace(" ", "-"),
+        "name": mta_id,
         "version": "1.0.0",
         "description": project_name,
         "dependencies": {
@@ -206,9 +324,157 @@ def _minimal_deployment(project_name, namespace):
         },
     }, indent=2)
 
-    gitignore = "node_modules/\ndefault-*.json\ngen/\n*.mtar\n.env\n"
+    return [
+        {"path": "package.json", "content": pkg, "file_type": "json"},
+        {"path": ".gitignore", "content": _GITIGNORE, "file_type": "config"},
+    ]
+
+
+_GITIGNORE = "node_modules/\ndefault-*.json\ngen/\nmta_archives/\n*.mtar\n.env\n"
+
+
+def _template_deployment(project_name: str, mta_id: str, database_type: str) -> list[GeneratedFile]:
+    """
+    Complete deployment descriptor set for a standard CAP project: srv and
+    HDI deployer modules bound to hana and xsuaa services, with SQLite and
+    mocked auth for local development.
+    """
+    db_requires = (
+        {"[development]": {"kind": "sqlite", "credentials": {"url": "db.sqlite"}}, "[production]": {"kind": "hana"}}
+        if database_type == DatabaseType.SQLITE.value
+        else {"kind": "hana"}
+    )
+    pkg = json.dumps({
+        "name": mta_id,
+        "version": "1.0.0",
+        "description": project_name,
+        "private": True,
+        "dependencies": {
+            "@sap/cds": "^8",
+            "@sap/cds-hana": "^2",
+            "@sap/xssec": "^4",
+            "express": "^4",
+            "hdb": "^0.19",
+        },
+        "devDependencies": {
+            "@cap-js/sqlite": "^1",
+            "@sap/cds-dk": "^8",
+        },
+        "scripts": {
+            "start": "cds-serve",
+            "watch": "cds watch",
+            "build": "cds build --production",
+            "deploy": "mbt build && cf deploy mta_archives/*.mtar",
+        },
+        "cds": {
+            "requires": {
+                "db": db_requires,
+                "auth": {"[development]": {"kind": "mocked"}, "[production]": {"kind": "xsuaa"}},
+            },
+        },
+    }, indent=2)
+
+    mta_yaml = f"""_schema-version: '3.1'
+ID: {mta_id}
+version: 1.0.0
+description: "{project_name}"
+parameters:
+  enable-parallel-deployments: true
+build-parameters:
+  before-all:
+    - builder: custom
+      commands:
+        - npm ci
+        - npx cds build --production
+modules:
+  - name: {mta_id}-srv
+    type: nodejs
+    path: gen/srv
+    parameters:
+      buildpack: nodejs_buildpack
+    build-parameters:
+      builder: npm
+    provides:
+      - name: srv-api
+        properties:
+          srv-url: ${{default-url}}
+    requires:
+      - name: {mta_id}-db
+      - name: {mta_id}-auth
+  - name: {mta_id}-db-deployer
+    type: hdb
+    path: gen/db
+    parameters:
+      buildpack: nodejs_buildpack
+    requires:
+      - name: {mta_id}-db
+resources:
+  - name: {mta_id}-db
+    type: com.sap.xs.hdi-container
+    parameters:
+      service: hana
+      service-plan: hdi-shared
+  - name: {mta_id}-auth
+    type: org.cloudfoundry.managed-service
+    parameters:
+      service: xsuaa
+      service-plan: application
+      path: ./xs-security.json
+      config:
+        xsappname: {mta_id}-${{org}}-${{space}}
+        tenant-mode: dedicated
+"""
+
+    readme = f"""# {project_name}
+
+SAP CAP application.
+
+## Run locally
+
+```bash
+npm install
+npm run watch
+```
+
+## Deploy to Cloud Foundry
+
+```bash
+npm run deploy
+```
+
+This builds the MTA archive with `mbt` and deploys the service, the HDI
+deployer and the `hana` and `xsuaa` service instances defined in `mta.yaml`.
+"""
+
+    eslintrc = json.dumps({
+        "root": True,
+        "extends": "eslint:recommended",
+        "env": {"node": True, "es2022": True},
+        "globals": {"SELECT": "readonly", "INSERT": "readonly", "UPDATE": "readonly", "DELETE": "readonly", "cds": "readonly"},
+    }, indent=2)
+    prettierrc = json.dumps({"singleQuote": True, "printWidth": 120}, indent=2)
+
+    piper_config = """general:
+  buildTool: "mta"
+stages:
+  Build: {}
+  Release:
+    cloudFoundryDeploy: true
+steps:
+  mtaBuild:
+    mtaBuildTool: "cloudMbt"
+  cloudFoundryDeploy:
+    mtaDeployParameters: "-f --version-rule ALL"
+"""
 
     return [
+        {"path": "mta.yaml", "content": mta_yaml, "file_type": "yaml"},
         {"path": "package.json", "content": pkg, "file_type": "json"},
-        {"path": ".gitignore", "content": gitignore, "file_type": "config"},
+        {"path": ".npmrc", "content": "@sap:registry=https://registry.npmjs.org/\n", "file_type": "config"},
+        {"path": ".env.sample", "content": "PORT=4004\nCDS_ENV=development\n", "file_type": "config"},
+        {"path": "README.md", "content": readme, "file_type": "markdown"},
+        {"path": ".gitignore", "content": _GITIGNORE, "file_type": "config"},
+        {"path": ".eslintrc.json", "content": eslintrc, "file_type": "json"},
+        {"path": ".prettierrc.json", "content": prettierrc, "file_type": "json"},
+        {"path": ".pipeline/config.yml", "content": piper_config, "file_type": "yaml"},
     ]
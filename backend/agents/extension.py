@@ -6,20 +6,24 @@ Generates Clean Core compliant extension points and hooks for SAP CAP applicatio
 FULLY LLM-DRIVEN with inter-agent context.
 """
 
-import json
 import logging
-from datetime import datetime
+import re
+import time
+from datetime import datetime, timezone
 
 from backend.agents.llm_utils import (
     generate_with_retry,
-    get_full_context,
+    get_architecture_context,
+    json_dumps_compact,
 )
+from backend.agents.llm_cache import get_llm_cache
 from backend.agents.state import (
+    ArtifactSpec,
     BuilderState,
     GeneratedFile,
     ValidationError,
 )
-from backend.agents.progress import log_progress
+from backend.agents.progress import ProgressBuffer
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +37,13 @@ RULES:
 3. Hook system with before/after lifecycle hooks per entity
 4. Provide a developer guide in Markdown
 5. Use proper module exports
+6. Run "after" hooks concurrently with Promise.allSettled and log each rejected
+   result; keep "before" hooks sequential since they may modify the request
+
+GENERATE:
+1. db/extensions.cds — CDS aspects for extending entities
+2. srv/lib/hooks.js — Hook registration system with lifecycle hooks per entity
+3. docs/EXTENSION_GUIDE.md — Developer guide for extending the app
 
 OUTPUT FORMAT:
 {
@@ -43,6 +54,8 @@ OUTPUT FORMAT:
 Return ONLY valid JSON."""
 
 
+# Only project-specific data goes in the user prompt; the static
+# instructions live in the system prompt so the provider can cache them.
 EXTENSION_PROMPT = """Generate extension points for this SAP CAP application.
 
 Project: {project_name}
@@ -53,66 +66,94 @@ ENTITIES:
 {entities_json}
 
 BUSINESS RULES:
-{business_rules_json}
+{business_rules_json}"""
 
-Generate:
-1. db/extensions.cds — CDS aspects for extending entities
-2. srv/lib/hooks.js — Hook registration system with lifecycle hooks per entity
-3. docs/EXTENSION_GUIDE.md — Developer guide for extending the app
 
-Respond with ONLY valid JSON."""
+# LLM response key -> artifact target
+EXTENSION_FILE_MAP = {
+    "extension_cds": ArtifactSpec("db/extensions.cds", "cds"),
+    "hooks_js": ArtifactSpec("srv/lib/hooks.js", "javascript"),
+    "extension_guide_md": ArtifactSpec("docs/EXTENSION_GUIDE.md", "markdown"),
+}
 
 
 async def extension_agent(state: BuilderState) -> BuilderState:
     """Extension Agent (LLM-Driven)"""
     logger.info("Starting Extension Agent (LLM-Driven)")
 
-    now = datetime.utcnow().isoformat()
+    started_at = time.perf_counter()
+    now = datetime.now(timezone.utc).isoformat()
     errors: list[ValidationError] = []
     generated_files: list[GeneratedFile] = []
 
     state["current_agent"] = "extension"
     state["updated_at"] = now
     state["current_logs"] = []
-    log_progress(state, "Starting extension phase...")
+    progress = ProgressBuffer(state)
+    progress.add("Starting extension phase...")
 
     entities = state.get("entities", [])
     project_name = state.get("project_name", "App")
     business_rules = state.get("business_rules", [])
-    context = get_full_context(state)
+    context = _extension_context(state)
 
     prompt = EXTENSION_PROMPT.format(
         project_name=project_name,
         context=context or "(no prior context available)",
-        entities_json=json.dumps(entities, indent=2),
-        business_rules_json=json.dumps(business_rules, indent=2),
+        entities_json=json_dumps_compact(entities),
+        business_rules_json=json_dumps_compact(business_rules),
     )
 
-    log_progress(state, "Calling LLM for extension generation...")
+    # Without entities there is nothing to extend; the minimal hook file
+    # is all the LLM could produce, so skip the round trip
+    cache = get_llm_cache() if entities else None
+    result = None
+    if cache:
+        cache_key = cache.make_key("extension", {
+            "system_prompt": EXTENSION_SYSTEM_PROMPT,
+            "prompt": prompt,
+            "provider": state.get("llm_provider"),
+            "model": state.get("llm_model"),
+            "complexity": state.get("complexity_level"),
+        })
+        result = await cache.aget(cache_key)
 
-    result = await generate_with_retry(
-        prompt=prompt,
-        system_prompt=EXTENSION_SYSTEM_PROMPT,
-        state=state,
-        required_keys=["hooks_js"],
-        max_retries=3,
-        agent_name="extension",
-    )
+    if not entities:
+        progress.add("No entities defined. Using minimal extension structure without LLM call.")
+    elif result:
+        progress.add("♻️ Reusing cached extension files.")
+    else:
+        progress.add("Calling LLM for extension generation...")
+        progress.flush()
+
+        result = await generate_with_retry(
+            prompt=prompt,
+            system_prompt=EXTENSION_SYSTEM_PROMPT,
+            state=state,
+            required_keys=["hooks_js"],
+            max_retries=3,
+            agent_name="extension",
+            cache_system_prompt=True,
+            json_mode=True,
+        )
+        if result and cache:
+            await cache.aset(cache_key, result)
 
     if result:
-        file_map = {
-            "extension_cds": ("db/extensions.cds", "cds"),
-            "hooks_js": ("srv/lib/hooks.js", "javascript"),
-            "extension_guide_md": ("docs/EXTENSION_GUIDE.md", "markdown"),
-        }
-        for key, (path, file_type) in file_map.items():
+        for key, (path, file_type) in EXTENSION_FILE_MAP.items():
             content = result.get(key, "")
             if content:
                 generated_files.append({"path": path, "content": content, "file_type": file_type})
 
-        log_progress(state, f"✅ Generated {len(generated_files)} extension files.")
+        progress.add(f"✅ Generated {len(generated_files)} extension files.")
+    elif not entities:
+        generated_files.append({
+            "path": "srv/lib/hooks.js",
+            "content": _minimal_hooks(entities),
+            "file_type": "javascript",
+        })
     else:
-        log_progress(state, "⚠️ LLM failed. Generating minimal extension structure.")
+        progress.add("⚠️ LLM failed. Generating minimal extension structure.")
         generated_files.append({
             "path": "srv/lib/hooks.js",
             "content": _minimal_hooks(entities),
@@ -126,8 +167,8 @@ async def extension_agent(state: BuilderState) -> BuilderState:
             "severity": "warning",
         })
 
-    existing = state.get("artifacts_srv", [])
-    state["artifacts_srv"] = existing + generated_files
+    # Extend in place rather than copying every earlier agent's artifacts
+    state.setdefault("artifacts_srv", []).extend(generated_files)
     state["validation_errors"] = state.get("validation_errors", []) + errors
     state["needs_correction"] = False
 
@@ -135,27 +176,80 @@ async def extension_agent(state: BuilderState) -> BuilderState:
         "agent_name": "extension",
         "status": "completed",
         "started_at": now,
-        "completed_at": datetime.utcnow().isoformat(),
-        "duration_ms": None,
+        "completed_at": datetime.now(timezone.utc).isoformat(),
+        "duration_ms": int((time.perf_counter() - started_at) * 1000),
         "error": None,
         "logs": state.get("current_logs", []),
     }]
 
-    log_progress(state, f"Extension complete. Generated {len(generated_files)} files.")
+    progress.add(f"Extension complete. Generated {len(generated_files)} files.")
+    progress.flush()
     return state
 
 
+# CDS blocks whose members are kept in a summary (everything else is folded)
+_CDS_CONTAINER_RE = re.compile(r"^\s*(service|context)\b")
+
+
+def _summarize_cds(content: str, max_chars: int = 4000) -> str:
+    """
+    Outline a CDS file: keep namespace/using lines, annotations and the
+    headers of entities, types and aspects, but fold their bodies to
+    `{ ... }`. Members of service/context blocks stay listed.
+    """
+    lines: list[str] = []
+    depth = 0
+    fold_depth: int | None = None
+    for line in content.splitlines():
+        opens, closes = line.count("{"), line.count("}")
+        if fold_depth is None and line.strip():
+            if opens > closes and not _CDS_CONTAINER_RE.match(line):
+                lines.append(line.split("{", 1)[0].rstrip() + " { ... }")
+                fold_depth = depth
+            else:
+                lines.append(line)
+        depth += opens - closes
+        if fold_depth is not None and depth <= fold_depth:
+            fold_depth = None
+
+    summary = "\n".join(lines)
+    if len(summary) > max_chars:
+        summary = summary[:max_chars].rsplit("\n", 1)[0] + "\n// ... (truncated)"
+    return summary
+
+
+def _extension_context(state: BuilderState) -> str:
+    """
+    Inter-agent context for the extension prompt. Schema and service are
+    outlined rather than sent in full: the entities JSON already carries
+    the fields, and a short prompt keeps large projects cheap.
+    """
+    parts = []
+    architecture_ctx = get_architecture_context(state)
+    if architecture_ctx:
+        parts.append(architecture_ctx)
+    schema = state.get("generated_schema_cds", "")
+    if schema:
+        parts.append(f"CDS SCHEMA OUTLINE (db/schema.cds):\n```cds\n{_summarize_cds(schema)}\n```\n")
+    service = state.get("generated_service_cds", "")
+    if service:
+        parts.append(f"SERVICE OUTLINE (srv/service.cds):\n```cds\n{_summarize_cds(service)}\n```\n")
+    return "\n".join(parts)
+
+
+_MINIMAL_HOOKS_HEADER = """'use strict';
+
+const hooks = {};
+
+"""
+
+_MINIMAL_HOOKS_FOOTER = """
+module.exports = { hooks };"""
+
+
 def _minimal_hooks(entities):
     """Minimal hook system."""
-    entity_names = [e.get("name", "") for e in entities]
-    lines = [
-        "'use strict';",
-        "",
-        "const hooks = {};",
-        "",
-    ]
-    for name in entity_names:
-        lines.append(f"hooks['{name}'] = {{ before: {{}}, after: {{}} }};")
-    lines.append("")
-    lines.append("module.exports = { hooks };")
-    return "\n".join(lines)
+    registrations = "".join(
+        f"hooks['{e.get('name', '')}'] = {{ before: {{}}, after: {{}} }};\n" for e in entities
+    )
+    return f"{_MINIMAL_HOOKS_HEADER}{registrations}{_MINIMAL_HOOKS_FOOTER}"
@@ -7,9 +7,13 @@ Component.js, and related configuration for List Report and Object Page apps.
 FULLY LLM-DRIVEN with inter-agent context.
 """
 
-import json
+import asyncio
 import logging
-from datetime import datetime
+import re
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from string import Template
 from typing import Any
 
 from backend.agents.llm_utils import (
@@ -17,16 +21,25 @@ from backend.agents.llm_utils import (
     get_architecture_context,
     get_schema_context,
     get_service_context,
+    json_dumps_compact,
+    json_dumps_indented,
     store_generated_content,
 )
 from backend.agents.knowledge_loader import get_fiori_knowledge
 from backend.agents.state import (
+    ArtifactSpec,
     BuilderState,
+    FioriAppType,
     GeneratedFile,
     LayoutMode,
     ValidationError,
 )
-from backend.agents.progress import log_progress
+from backend.agents.progress import ProgressBuffer
+from backend.templates import (
+    render_component_js,
+    render_i18n_properties,
+    render_manifest_json,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -73,62 +86,102 @@ For MULTIPLE apps (enterprise/full_stack), return one entry per root entity.
 Return ONLY valid JSON."""
 
 
-FIORI_GENERATION_PROMPT = """Generate SAP Fiori Elements application configuration(s).
+# Static instructions come first so providers with prefix caching can reuse
+# them across projects; only FIORI_PROMPT_SUFFIX varies per run.
+FIORI_PROMPT_PREFIX = """Generate SAP Fiori Elements application configuration(s).
+
+For EACH app, generate:
+1. manifest.json — Full Fiori Elements manifest with sap.app, sap.ui5, routing, sap.cloud
+2. Component.js — UIComponent extending sap.fe.core.AppComponent
+3. i18n.properties — Internationalization with entity/field labels
+
+Also generate shared files:
+4. index.html — Launch page linking to first/main app
+5. flpSandbox.html — FLP sandbox with tiles for ALL generated apps"""
+
 
-Project: {project_name} ({app_id})
-Main Entity: {main_entity}
-Layout: {layout_mode}
-Theme: {fiori_theme}
-Complexity: {complexity}
+FIORI_PROMPT_SUFFIX = Template("""Project: $project_name ($app_id)
+Main Entity: $main_entity
+Layout: $layout_mode
+Theme: $fiori_theme
+Complexity: $complexity
 
-{architecture_context}
-{service_context}
+$architecture_context
+$service_context
 
 ENTITIES:
-{entities_json}
+$entities_json
 
 RELATIONSHIPS:
-{relationships_json}
+$relationships_json
 
-{multi_app_instructions}
+$multi_app_instructions
 
-For EACH app, generate:
-1. manifest.json — Full Fiori Elements manifest with sap.app, sap.ui5, routing, sap.cloud
-2. Component.js — UIComponent extending sap.fe.core.AppComponent
-3. i18n.properties — Internationalization with entity/field labels
+Respond with ONLY valid JSON.""")
 
-Also generate shared files:
-4. index.html — Launch page linking to first/main app
-5. flpSandbox.html — FLP sandbox with tiles for ALL generated apps
 
-Respond with ONLY valid JSON."""
+# LLM app entry key -> artifact target, relative to app/<entity>/
+FIORI_APP_FILE_MAP = {
+    "manifest_json": ArtifactSpec("webapp/manifest.json", "json"),
+    "component_js": ArtifactSpec("webapp/Component.js", "javascript"),
+    "i18n_properties": ArtifactSpec("webapp/i18n/i18n.properties", "properties"),
+    "ui5_yaml": ArtifactSpec("ui5.yaml", "yaml"),
+    "xs_app_json": ArtifactSpec("xs-app.json", "json"),
+}
+
+# Files shared by all apps, placed in the first app's folder
+FIORI_SHARED_FILE_MAP = {
+    "index_html": ArtifactSpec("webapp/index.html", "html"),
+    "flp_sandbox_html": ArtifactSpec("webapp/test/flpSandbox.html", "html"),
+}
+
+# Fiori Elements floorplan for the list page of the fallback app
+_LIST_TEMPLATE_FOR_APP_TYPE = {
+    FioriAppType.ANALYTICAL_LIST_PAGE.value: "sap.fe.templates.AnalyticalListPage",
+}
+_DEFAULT_LIST_TEMPLATE = "sap.fe.templates.ListReport"
+
+_APP_ID_TRANSLATION = str.maketrans("", "", " -_")
+_SERVICE_PATH_TRANSLATION = str.maketrans(" ", "-")
+
+
+@lru_cache(maxsize=32)
+def _derive_ids(project_name: str) -> tuple[str, str]:
+    """Return the (app_id, service_path) used for a project's Fiori apps."""
+    lowered = project_name.lower()
+    return lowered.translate(_APP_ID_TRANSLATION), f"/{lowered.translate(_SERVICE_PATH_TRANSLATION)}/"
 
 
 async def fiori_ui_agent(state: BuilderState) -> BuilderState:
     """SAP Fiori UI Agent (LLM-Driven) — supports multi-app generation."""
     logger.info("Starting Fiori UI Agent (LLM-Driven)")
 
-    now = datetime.utcnow().isoformat()
+    started_at = time.perf_counter()
+    now = datetime.now(timezone.utc).isoformat()
     errors: list[ValidationError] = []
     generated_files: list[GeneratedFile] = []
 
     state["current_agent"] = "fiori_ui"
     state["updated_at"] = now
     state["current_logs"] = []
-    log_progress(state, "Starting Fiori UI phase...")
+    progress = ProgressBuffer(state)
+    progress.add("Starting Fiori UI phase...")
 
     entities = state.get("entities", [])
     if not entities:
-        log_progress(state, "Error: No entities found.")
+        progress.add("Error: No entities found.")
+        progress.flush()
         return state
 
     project_name = state.get("project_name", "App")
     main_entity = state.get("fiori_main_entity", entities[0].get("name", ""))
     layout_mode = state.get("fiori_layout_mode", LayoutMode.FLEXIBLE_COLUMN.value)
     fiori_theme = state.get("fiori_theme", "sap_horizon")
+    list_template = _LIST_TEMPLATE_FOR_APP_TYPE.get(state.get("fiori_app_type"), _DEFAULT_LIST_TEMPLATE)
     relationships = state.get("relationships", [])
     complexity = state.get("complexity_level", "standard")
-    app_id = project_name.lower().replace(" ", "").replace("-", "").replace("_", "")
+    app_id, _ = _derive_ids(project_name)
+    main_app_dir = f"app/{main_entity.lower()}"
 
     service_context = get_service_context(state)
     architecture_context = get_architecture_context(state)
@@ -153,7 +206,7 @@ Child/composition entities should appear as ObjectPages within their parent's ap
         multi_app_instructions = f"""SINGLE-APP MODE: Generate 1 Fiori app for main entity '{main_entity}'.
 Include ObjectPages for ALL entities within this single app."""
 
-    prompt = FIORI_GENERATION_PROMPT.format(
+    prompt = FIORI_PROMPT_SUFFIX.substitute(
         project_name=project_name,
         app_id=app_id,
         main_entity=main_entity,
@@ -162,93 +215,83 @@ Include ObjectPages for ALL entities within this single app."""
         complexity=complexity,
         architecture_context=architecture_context or "(architecture blueprint not available)",
         service_context=service_context or "(service CDS not available)",
-        entities_json=json.dumps(entities, indent=2),
-        relationships_json=json.dumps(relationships, indent=2),
+        entities_json=json_dumps_compact(_prompt_entities(entities)),
+        relationships_json=json_dumps_compact(relationships),
         multi_app_instructions=multi_app_instructions,
     )
 
-    # Inject knowledge into prompt
-    prompt = f"{knowledge}\n\n{prompt}"
+    # Knowledge and instructions are the same for every project; keep them
+    # ahead of the project-specific part
+    prompt = f"{knowledge}\n\n{FIORI_PROMPT_PREFIX}\n\n{prompt}"
 
     # Self-Healing: Inject correction context if present
     correction_context = state.get("correction_context")
     if state.get("needs_correction") and state.get("correction_agent") == "fiori_ui" and correction_context:
-        log_progress(state, "Applying self-healing correction context from validation agent...")
+        progress.add("Applying self-healing correction context from validation agent...")
         correction_prompt = correction_context.get("correction_prompt", "")
         if correction_prompt:
             prompt = f"CRITICAL CORRECTION REQUIRED:\n{correction_prompt}\n\nORIGINAL INSTRUCTIONS:\n{prompt}"
 
-    log_progress(state, f"Calling LLM for Fiori UI generation ({complexity} complexity)...")
-
-    result = await generate_with_retry(
-        prompt=prompt,
-        system_prompt=FIORI_SYSTEM_PROMPT,
-        state=state,
-        required_keys=["apps"],
-        max_retries=3,
-        agent_name="fiori_ui",
-    )
-
-    if result and result.get("apps"):
-        apps = result["apps"]
-        if isinstance(apps, list):
-            for app_entry in apps:
-                entity_name = app_entry.get("entity", main_entity)
-                app_prefix = f"app/{entity_name.lower()}/webapp"
-                app_dir = f"app/{entity_name.lower()}"
-
-                if app_entry.get("manifest_json"):
-                    generated_files.append({"path": f"{app_prefix}/manifest.json", "content": app_entry["manifest_json"], "file_type": "json"})
-                if app_entry.get("component_js"):
-                    generated_files.append({"path": f"{app_prefix}/Component.js", "content": app_entry["component_js"], "file_type": "javascript"})
-                if app_entry.get("i18n_properties"):
-                    generated_files.append({"path": f"{app_prefix}/i18n/i18n.properties", "content": app_entry["i18n_properties"], "file_type": "properties"})
-                if app_entry.get("ui5_yaml"):
-                    generated_files.append({"path": f"{app_dir}/ui5.yaml", "content": app_entry["ui5_yaml"], "file_type": "yaml"})
-                if app_entry.get("xs_app_json"):
-                    generated_files.append({"path": f"{app_dir}/xs-app.json", "content": app_entry["xs_app_json"], "file_type": "json"})
-
-            # Shared files
-            first_entity = apps[0].get("entity", main_entity).lower()
-            if result.get("index_html"):
-                generated_files.append({"path": f"app/{first_entity}/webapp/index.html", "content": result["index_html"], "file_type": "html"})
-            if result.get("flp_sandbox_html"):
-                generated_files.append({"path": f"app/{first_entity}/webapp/test/flpSandbox.html", "content": result["flp_sandbox_html"], "file_type": "html"})
-
-            log_progress(state, f"✅ Generated {len(generated_files)} Fiori UI files across {len(apps)} app(s).")
+    # Prepare the template fallback alongside the LLM call so a failed
+    # generation does not add its own latency on top of the retries.
+    fallback_task = asyncio.create_task(asyncio.to_thread(
+        _minimal_fiori, project_name, main_entity, main_app_dir, fiori_theme, entities, list_template,
+    ))
+
+    progress.add(f"Calling LLM for Fiori UI generation ({complexity} complexity)...")
+    progress.flush()
+
+    try:
+        result = await generate_with_retry(
+            prompt=prompt,
+            system_prompt=FIORI_SYSTEM_PROMPT,
+            state=state,
+            required_keys=["apps"],
+            max_retries=3,
+            agent_name="fiori_ui",
+            cache_system_prompt=True,
+        )
+
+        if result and result.get("apps"):
+            apps = result["apps"]
+            if isinstance(apps, list):
+                for app_entry in apps:
+                    app_dir = f"app/{app_entry.get('entity', main_entity).lower()}"
+                    for key, (path, file_type) in FIORI_APP_FILE_MAP.items():
+                        if app_entry.get(key):
+                            generated_files.append({"path": f"{app_dir}/{path}", "content": _file_content(app_entry[key]), "file_type": file_type})
+
+                # Shared files
+                first_app_dir = f"app/{apps[0].get('entity', main_entity).lower()}"
+                for key, (path, file_type) in FIORI_SHARED_FILE_MAP.items():
+                    if result.get(key):
+                        generated_files.append({"path": f"{first_app_dir}/{path}", "content": _file_content(result[key]), "file_type": file_type})
+
+                progress.add(f"✅ Generated {len(generated_files)} Fiori UI files across {len(apps)} app(s).")
+            else:
+                progress.add("⚠️ Invalid apps format. Generating minimal Fiori config.")
+                generated_files.extend(await fallback_task)
+        elif result:
+            # Backward compatibility: old single-app format without 'apps' key
+            for key, (path, file_type) in (FIORI_APP_FILE_MAP | FIORI_SHARED_FILE_MAP).items():
+                content = result.get(key, "")
+                if content:
+                    generated_files.append({"path": f"{main_app_dir}/{path}", "content": _file_content(content), "file_type": file_type})
+            progress.add(f"✅ Generated {len(generated_files)} Fiori UI files (single-app mode).")
         else:
-            log_progress(state, "⚠️ Invalid apps format. Generating minimal Fiori config.")
-            app_prefix = f"app/{main_entity.lower()}/webapp"
-            generated_files.extend(_minimal_fiori(project_name, main_entity, app_prefix, fiori_theme))
-    elif result:
-        # Backward compatibility: old single-app format without 'apps' key
-        app_prefix = f"app/{main_entity.lower()}/webapp"
-        app_dir = f"app/{main_entity.lower()}"
-        file_map = {
-            "manifest_json": (f"{app_prefix}/manifest.json", "json"),
-            "component_js": (f"{app_prefix}/Component.js", "javascript"),
-            "i18n_properties": (f"{app_prefix}/i18n/i18n.properties", "properties"),
-            "index_html": (f"{app_prefix}/index.html", "html"),
-            "flp_sandbox_html": (f"{app_prefix}/test/flpSandbox.html", "html"),
-            "ui5_yaml": (f"{app_dir}/ui5.yaml", "yaml"),
-            "xs_app_json": (f"{app_dir}/xs-app.json", "json"),
-        }
-        for key, (path, file_type) in file_map.items():
-            content = result.get(key, "")
-            if content:
-                generated_files.append({"path": path, "content": content, "file_type": file_type})
-        log_progress(state, f"✅ Generated {len(generated_files)} Fiori UI files (single-app mode).")
-    else:
-        log_progress(state, "⚠️ LLM generation failed. Generating minimal Fiori config.")
-        app_prefix = f"app/{main_entity.lower()}/webapp"
-        generated_files.extend(_minimal_fiori(project_name, main_entity, app_prefix, fiori_theme))
-        errors.append({
-            "agent": "fiori_ui",
-            "code": "LLM_FAILED",
-            "message": "LLM Fiori generation failed. Minimal config generated.",
-            "field": None,
-            "severity": "warning",
-        })
+            progress.add("⚠️ LLM generation failed. Generating minimal Fiori config.")
+            generated_files.extend(await fallback_task)
+            errors.append({
+                "agent": "fiori_ui",
+                "code": "LLM_FAILED",
+                "message": "LLM Fiori generation failed. Minimal config generated.",
+                "field": None,
+                "severity": "warning",
+            })
+    finally:
+        # Drop the fallback when the LLM output was used or the agent is
+        # cancelled mid-call (no-op if awaited above)
+        fallback_task.cancel()
 
     store_generated_content(state, generated_files, {
         "manifest.json": "generated_manifest_json",
@@ -262,47 +305,144 @@ Include ObjectPages for ALL entities within this single app."""
         "agent_name": "fiori_ui",
         "status": "completed",
         "started_at": now,
-        "completed_at": datetime.utcnow().isoformat(),
-        "duration_ms": None,
+        "completed_at": datetime.now(timezone.utc).isoformat(),
+        "duration_ms": int((time.perf_counter() - started_at) * 1000),
         "error": None,
         "logs": state.get("current_logs", []),
     }]
 
-    log_progress(state, f"Fiori UI complete. Generated {len(generated_files)} files.")
+    progress.add(f"Fiori UI complete. Generated {len(generated_files)} files.")
+    progress.flush()
     return state
 
 
-def _minimal_fiori(project_name, main_entity, app_prefix, theme):
-    """Minimal Fiori config files."""
-    manifest = json.dumps({
-        "_version": "1.59.0",
-        "sap.app": {
-            "id": project_name.lower().replace(" ", ""),
-            "type": "application",
-            "title": project_name,
-            "dataSources": {
-                "mainService": {
-                    "uri": f"/{project_name.lower().replace(' ', '-')}/",
-                    "type": "OData",
-                    "settings": {"odataVersion": "4.0"}
-                }
-            }
+def _file_content(value: Any) -> str:
+    """
+    File text for an LLM response value. JSON files sometimes come back as
+    objects rather than strings (notably in JSON mode); serialize those once
+    here so artifacts always carry text.
+    """
+    if isinstance(value, str):
+        return value
+    return json_dumps_indented(value)
+
+
+# Approuter routes for an app served from the HTML5 application repository;
+# identical for every project, so serialized once at import
+_XS_APP_JSON = json_dumps_indented({
+    "welcomeFile": "/index.html",
+    "authenticationMethod": "route",
+    "routes": [
+        {
+            "source": "^/resources/(.*)$",
+            "target": "/resources/$1",
+            "authenticationType": "none",
+            "destination": "ui5"
+        },
+        {
+            "source": "^/test-resources/(.*)$",
+            "target": "/test-resources/$1",
+            "authenticationType": "none",
+            "destination": "ui5"
         },
-        "sap.ui5": {
-            "models": {
-                "": {"dataSource": "mainService", "settings": {"synchronizationMode": "None"}}
-            }
+        {
+            "source": "^(.*)$",
+            "target": "$1",
+            "service": "html5-apps-repo-rt",
+            "authenticationType": "xsuaa"
         }
-    }, indent=2)
+    ]
+})
+
+
+def _prompt_entities(entities: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    The parts of each entity the UI prompt needs: names, types, keys and
+    labels. Lengths, defaults and aspects only matter to the data model,
+    and the service outline already carries the projections.
+    """
+    projected = []
+    for entity in entities:
+        fields = []
+        for field in entity.get("fields", ()):
+            item = {"name": field.get("name"), "type": field.get("type")}
+            if field.get("key"):
+                item["key"] = True
+            annotations = field.get("annotations")
+            if isinstance(annotations, dict) and annotations.get("title"):
+                item["title"] = annotations["title"]
+            fields.append(item)
+        projected.append({
+            "name": entity.get("name"),
+            "description": entity.get("description", ""),
+            "fields": fields,
+        })
+    return projected
+
+
+# Word boundaries inside camelCase names ("orderDate" -> "order Date")
+_CAMEL_RE = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+
+
+# Field names like ID, status or createdAt recur across entities and runs
+@lru_cache(maxsize=1024)
+def _label(name: str) -> str:
+    """Human-readable label for a CDS element name."""
+    label = _CAMEL_RE.sub(" ", name).replace("_", " ")
+    return label[:1].upper() + label[1:]
+
+
+def _i18n_labels(entities: list[dict[str, Any]]) -> list[tuple[str, str]]:
+    """i18n (key, label) pairs for each entity and its fields."""
+    labels: list[tuple[str, str]] = []
+    for entity in entities:
+        name = entity.get("name")
+        if not name:
+            continue
+        labels.append((name, _label(name)))
+        # Unnamed fields would produce keys like "Order_"; skip them
+        labels.extend(
+            (f"{name}_{field_name}", _label(field_name))
+            for field_name in filter(None, (field.get("name") for field in entity.get("fields", ())))
+        )
+    return labels
+
+
+@lru_cache(maxsize=128)
+def _render_descriptors(
+    project_name: str, main_entity: str, theme: str, list_template: str,
+) -> tuple[str, str]:
+    """Rendered (manifest.json, Component.js) for the fallback app; reused across runs."""
+    app_id, service_path = _derive_ids(project_name)
+    manifest = render_manifest_json(
+        app_id=app_id,
+        app_title=project_name,
+        service_path=service_path,
+        main_entity=main_entity,
+        theme=theme,
+        list_template=list_template,
+    )
+    return manifest, render_component_js(app_id)
+
+
+@lru_cache(maxsize=128)
+def _render_i18n(project_name: str, labels: tuple[tuple[str, str], ...]) -> str:
+    """Rendered i18n.properties for the fallback app; reused across runs."""
+    return render_i18n_properties(
+        project_name,
+        f"{project_name} - SAP Fiori Elements",
+        list(labels),
+    )
+
 
-    component = f"""sap.ui.define(["sap/fe/core/AppComponent"], function(AppComponent) {{
-  "use strict";
-  return AppComponent.extend("{project_name.lower().replace(' ', '')}.Component", {{
-    metadata: {{ manifest: "json" }}
-  }});
-}});"""
+def _minimal_fiori(project_name, main_entity, app_dir, theme, entities=(), list_template=_DEFAULT_LIST_TEMPLATE):
+    """Minimal Fiori config files, rendered from the shared Jinja2 templates."""
+    manifest, component = _render_descriptors(project_name, main_entity, theme, list_template)
+    i18n = _render_i18n(project_name, tuple(_i18n_labels(entities)))
 
     return [
-        {"path": f"{app_prefix}/manifest.json", "content": manifest, "file_type": "json"},
-        {"path": f"{app_prefix}/Component.js", "content": component, "file_type": "javascript"},
+        {"path": f"{app_dir}/webapp/manifest.json", "content": manifest, "file_type": "json"},
+        {"path": f"{app_dir}/webapp/Component.js", "content": component, "file_type": "javascript"},
+        {"path": f"{app_dir}/webapp/i18n/i18n.properties", "content": i18n, "file_type": "properties"},
+        {"path": f"{app_dir}/xs-app.json", "content": _XS_APP_JSON, "file_type": "json"},
     ]
@@ -6,8 +6,10 @@ Uses LangGraph StateGraph for stateful, deterministic execution.
 """
 
 import asyncio
+import copy
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Literal, Any
 
 from langgraph.graph import StateGraph, END
@@ -128,7 +130,7 @@ def should_self_heal(state: BuilderState) -> str:
             "compliance_check", "performance_review", "deployment", "testing"
         ]
         if target in valid_targets:
-            logger.info(f"Self-healing: routing back to {target}")
+            logger.info("Self-healing: routing back to %s", target)
             return target
     return "end"
 
@@ -151,17 +153,20 @@ def should_continue_after_gate(state: BuilderState, next_node: str, refine_node:
         # BUG FIX #3: Validate correction_agent matches expected refine_node
         # If correction_agent is set but doesn't match refine_node, use refine_node as fallback
         if correction_agent and correction_agent != refine_node:
-            logger.warning(f"Gate correction_agent '{correction_agent}' doesn't match expected refine_node '{refine_node}'. "
-                          f"Using refine_node as fallback to avoid routing errors.")
+            logger.warning(
+                "Gate correction_agent '%s' doesn't match expected refine_node '%s'. "
+                "Using refine_node as fallback to avoid routing errors.",
+                correction_agent, refine_node,
+            )
             correction_agent = refine_node
         elif not correction_agent:
             # If correction_agent is None, default to refine_node
             correction_agent = refine_node
         
-        logger.info(f"Gate refinement: routing to {correction_agent}")
+        logger.info("Gate refinement: routing to %s", correction_agent)
         return correction_agent
     
-    logger.info(f"Gate approved: continuing to {next_node}")
+    logger.info("Gate approved: continuing to %s", next_node)
     return next_node
 
 
@@ -229,6 +234,123 @@ async def parallel_phase_4_fanin(state: BuilderState) -> BuilderState:
     return state
 
 
+# =============================================================================
+# Concurrent Phases
+# =============================================================================
+
+def _branch_additions(original: Any, value: list) -> list:
+    """Items a branch appended to ``original``, or the whole list if it replaced it."""
+    if isinstance(original, list) and value[:len(original)] == original:
+        return value[len(original):]
+    return value
+
+
+def _merge_branch(base: BuilderState, merged: BuilderState, branch: BuilderState) -> None:
+    """
+    Fold one branch's updates into ``merged``.
+
+    Lists the branch only appended to (artifacts, agent_history,
+    validation_errors) keep every branch's additions, and each branch's
+    current_logs are concatenated since every agent starts its own; any
+    other changed value is taken from the branch.
+    """
+    for key, value in branch.items():
+        original = base.get(key)
+        if key == "current_logs" and isinstance(value, list):
+            merged[key] = merged.get(key, []) + _branch_additions(original, value)
+        elif (
+            isinstance(value, list)
+            and isinstance(original, list)
+            and value[:len(original)] == original
+        ):
+            merged[key] = merged.get(key, []) + value[len(original):]
+        elif value != original:
+            merged[key] = value
+
+
+async def run_agents_concurrently(state: BuilderState, agents: dict[str, Any], phase: str) -> BuilderState:
+    """
+    Run independent agents at the same time on copies of ``state`` and
+    merge their results.
+
+    Each agent gets its own deep copy so they cannot see each other's
+    partial updates. A branch that comes back with needs_correction is
+    re-run on its own output, like the should_retry_agent loop of a
+    sequential node, up to MAX_RETRIES times. When a self-healing pass
+    targets one of ``agents``, only that agent runs. An agent_complete
+    event is pushed as each one finishes, carrying the history of every
+    agent completed so far.
+    """
+    from backend.agents.progress import push_event
+
+    target = state.get("correction_agent")
+    if state.get("needs_correction") and target in agents:
+        agents = {target: agents[target]}
+
+    session_id = state.get("session_id", "")
+    completed_history = list(state.get("agent_history", []))
+    completed_errors = list(state.get("validation_errors", []))
+
+    max_retries = state.get("MAX_RETRIES", 5)
+
+    async def _run(agent):
+        branch = await agent(copy.deepcopy(state))
+        retries = 0
+        while branch.get("needs_correction") and retries < max_retries:
+            retries += 1
+            branch = await agent(branch)
+        history = _branch_additions(state.get("agent_history"), branch.get("agent_history", []))
+        completed_history.extend(history)
+        completed_errors.extend(
+            _branch_additions(state.get("validation_errors"), branch.get("validation_errors", []))
+        )
+        if history:
+            await push_event(session_id, {
+                "type": "agent_complete",
+                "agent": history[-1].get("agent_name"),
+                "status": history[-1].get("status"),
+                "agent_history": list(completed_history),
+                "validation_errors": list(completed_errors),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            })
+        return branch
+
+    branches = await asyncio.gather(*(_run(agent) for agent in agents.values()))
+
+    merged = dict(state)
+    merged["current_logs"] = []
+    for branch in branches:
+        _merge_branch(state, merged, branch)
+    merged["current_agent"] = phase
+    merged["updated_at"] = datetime.now(timezone.utc).isoformat()
+    return merged
+
+
+# Agents run by each concurrent phase node, keyed by self-healing target name
+PARALLEL_PHASE_3_AGENTS = {
+    "fiori_ui": fiori_ui_agent,
+    "security": security_agent,
+    "multitenancy": multitenancy_agent,
+    "i18n": i18n_agent,
+    "feature_flags": feature_flags_agent,
+}
+PARALLEL_PHASE_4_AGENTS = {
+    "testing": testing_agent,
+    "documentation": documentation_agent,
+    "observability": observability_agent,
+}
+
+
+async def parallel_phase_3(state: BuilderState) -> BuilderState:
+    """Parallel Phase 3: Fiori UI, security, multitenancy, i18n and feature flags at once."""
+    return await run_agents_concurrently(state, PARALLEL_PHASE_3_AGENTS, "parallel_phase_3")
+
+
+async def parallel_phase_4(state: BuilderState) -> BuilderState:
+    """Parallel Phase 4: testing, documentation and observability at once."""
+    return await run_agents_concurrently(state, PARALLEL_PHASE_4_AGENTS, "parallel_phase_4")
+
+
 async def failed_terminal(state: BuilderState) -> BuilderState:
     """
     FAILED terminal node.
@@ -254,7 +376,7 @@ async def failed_terminal(state: BuilderState) -> BuilderState:
             "timestamp": datetime.utcnow().isoformat(),
         }))
     except Exception as e:
-        logger.error(f"Failed to emit workflow_failed event: {e}")
+        logger.error("Failed to emit workflow_failed event: %s", e)
     
     return state
 
@@ -310,19 +432,13 @@ def create_builder_graph() -> StateGraph:
     graph.add_node("api_governance", api_governance_agent)
     graph.add_node("business_logic", business_logic_agent)
     graph.add_node("ux_design", ux_design_agent)
-    graph.add_node("fiori_ui", fiori_ui_agent)
-    graph.add_node("security", security_agent)
-    graph.add_node("multitenancy", multitenancy_agent)
-    graph.add_node("i18n", i18n_agent)
-    graph.add_node("feature_flags", feature_flags_agent)
+    # fiori_ui, security, multitenancy, i18n and feature_flags run inside parallel_phase_3
     graph.add_node("compliance_check", compliance_check_agent)
     graph.add_node("extension", extension_agent)
     graph.add_node("performance_review", performance_review_agent)
     graph.add_node("ci_cd", ci_cd_agent)
     graph.add_node("deployment", deployment_agent)
-    graph.add_node("testing", testing_agent)
-    graph.add_node("observability", observability_agent)
-    graph.add_node("documentation", documentation_agent)
+    # testing, documentation and observability run inside parallel_phase_4
     graph.add_node("integration", integration_agent)
     graph.add_node("project_assembly", project_assembly_agent)
     graph.add_node("project_verification", project_verification_agent)
@@ -344,7 +460,9 @@ def create_builder_graph() -> StateGraph:
     # =========================================================================
     graph.add_node("parallel_phase_1_fanin", parallel_phase_1_fanin)
     graph.add_node("parallel_phase_2_fanin", parallel_phase_2_fanin)
+    graph.add_node("parallel_phase_3", parallel_phase_3)
     graph.add_node("parallel_phase_3_fanin", parallel_phase_3_fanin)
+    graph.add_node("parallel_phase_4", parallel_phase_4)
     graph.add_node("parallel_phase_4_fanin", parallel_phase_4_fanin)
     
     # =========================================================================
@@ -539,66 +657,19 @@ def create_builder_graph() -> StateGraph:
         }
     )
     
-    # 15. UX Design → Fiori UI (Parallel Phase 3 start)
+    # 15. UX Design → Parallel Phase 3 (Fiori UI + Security + Multitenancy + i18n + Feature Flags)
     graph.add_conditional_edges(
         "ux_design",
         should_retry_agent,
         {
             "retry": "ux_design",
-            "continue": "fiori_ui",
-        }
-    )
-    
-    # 16. Fiori UI → Security
-    graph.add_conditional_edges(
-        "fiori_ui",
-        should_retry_agent,
-        {
-            "retry": "fiori_ui",
-            "continue": "security",
+            "continue": "parallel_phase_3",
         }
     )
-    
-    # 17. Security → Multitenancy
-    graph.add_conditional_edges(
-        "security",
-        should_retry_agent,
-        {
-            "retry": "security",
-            "continue": "multitenancy",
-        }
-    )
-    
-    # 18. Multitenancy → i18n
-    graph.add_conditional_edges(
-        "multitenancy",
-        should_retry_agent,
-        {
-            "retry": "multitenancy",
-            "continue": "i18n",
-        }
-    )
-    
-    # 19. i18n → Feature Flags
-    graph.add_conditional_edges(
-        "i18n",
-        should_retry_agent,
-        {
-            "retry": "i18n",
-            "continue": "feature_flags",
-        }
-    )
-    
-    # 20. Feature Flags → Parallel Phase 3 Fan-in
-    graph.add_conditional_edges(
-        "feature_flags",
-        should_retry_agent,
-        {
-            "retry": "feature_flags",
-            "continue": "parallel_phase_3_fanin",
-        }
-    )
-    
+
+    # 16-20. Parallel Phase 3 → Parallel Phase 3 Fan-in
+    graph.add_edge("parallel_phase_3", "parallel_phase_3_fanin")
+
     # 21. Parallel Phase 3 Fan-in → Compliance Check
     graph.add_edge("parallel_phase_3_fanin", "compliance_check")
     
@@ -652,24 +723,18 @@ def create_builder_graph() -> StateGraph:
         }
     )
     
-    # 26. Deployment → Testing (Parallel Phase 4 start)
+    # 26. Deployment → Parallel Phase 4 (testing + documentation + observability)
     graph.add_conditional_edges(
         "deployment",
         should_retry_agent,
         {
             "retry": "deployment",
-            "continue": "testing",
+            "continue": "parallel_phase_4",
         }
     )
     
-    # 27. Testing → Documentation
-    graph.add_edge("testing", "documentation")
-    
-    # 28. Documentation → Observability
-    graph.add_edge("documentation", "observability")
-    
-    # 29. Observability → Parallel Phase 4 Fan-in
-    graph.add_edge("observability", "parallel_phase_4_fanin")
+    # 27-29. Parallel Phase 4 → Parallel Phase 4 Fan-in
+    graph.add_edge("parallel_phase_4", "parallel_phase_4_fanin")
     
     # 30. Parallel Phase 4 Fan-in → Project Assembly
     graph.add_edge("parallel_phase_4_fanin", "project_assembly")
@@ -691,6 +756,7 @@ def create_builder_graph() -> StateGraph:
     )
     
     # 33a. Gate 7 → self-heal back to agent OR end
+    # (concurrent phases re-run only the agent named in correction_agent)
     graph.add_conditional_edges(
         "gate_7_final_release",
         should_self_heal,
@@ -702,13 +768,13 @@ def create_builder_graph() -> StateGraph:
             "service_exposure": "service_exposure",
             "error_handling": "error_handling",
             "business_logic": "business_logic",
-            "fiori_ui": "fiori_ui",
-            "security": "security",
-            "multitenancy": "multitenancy",
+            "fiori_ui": "parallel_phase_3",
+            "security": "parallel_phase_3",
+            "multitenancy": "parallel_phase_3",
             "compliance_check": "compliance_check",
             "performance_review": "performance_review",
             "deployment": "deployment",
-            "testing": "testing",
+            "testing": "parallel_phase_4",
             "end": END,
         }
     )
@@ -719,17 +785,28 @@ def create_builder_graph() -> StateGraph:
     return graph
 
 
-# Global compiled graph instance
-_compiled_graph = None
+# Graph nodes that push their own agent_complete events per agent
+CONCURRENT_PHASES = ("parallel_phase_3", "parallel_phase_4")
+
+# Seconds between keep-alive events on the SSE stream
+SSE_HEARTBEAT_SECONDS = 60.0
+
+# Agent order for emitting agent_start events (28 agents total)
+AGENT_ORDER = (
+    "requirements", "enterprise_architecture", "domain_modeling", "data_modeling",
+    "db_migration", "integration", "service_exposure", "integration_design",
+    "error_handling", "audit_logging", "api_governance", "business_logic",
+    "ux_design", "fiori_ui", "security", "multitenancy", "i18n", "feature_flags",
+    "compliance_check", "extension", "performance_review", "ci_cd", "deployment",
+    "testing", "documentation", "observability", "project_assembly",
+    "project_verification", "validation",
+)
 
 
+@lru_cache(maxsize=1)
 def get_builder_graph():
     """Get or create the compiled builder graph."""
-    global _compiled_graph
-    if _compiled_graph is None:
-        graph = create_builder_graph()
-        _compiled_graph = graph.compile()
-    return _compiled_graph
+    return create_builder_graph().compile()
 
 
 async def run_generation_workflow(initial_state: BuilderState) -> BuilderState:
@@ -740,13 +817,15 @@ async def run_generation_workflow(initial_state: BuilderState) -> BuilderState:
         initial_state: Initial BuilderState with user configuration
         
     Returns:
-        Final BuilderState with all generated artifacts
+        Final BuilderState with all generated artifacts. If the graph raises,
+        the initial state is returned with generation_status FAILED and a
+        WORKFLOW_ERROR entry in validation_errors.
     """
-    logger.info(f"Starting generation workflow for project: {initial_state.get('project_name')}")
+    logger.info("Starting generation workflow for project: %s", initial_state.get("project_name"))
     
     # Set generation status
     initial_state["generation_status"] = GenerationStatus.IN_PROGRESS.value
-    initial_state["generation_started_at"] = datetime.utcnow().isoformat()
+    initial_state["generation_started_at"] = datetime.now(timezone.utc).isoformat()
     
     # Get compiled graph
     graph = get_builder_graph()
@@ -757,8 +836,11 @@ async def run_generation_workflow(initial_state: BuilderState) -> BuilderState:
         logger.info("Generation workflow completed")
         return final_state
     except Exception as e:
-        logger.exception(f"Generation workflow failed: {e}")
+        # Report the failure in the returned state; callers check
+        # generation_status rather than catching
+        logger.exception("Generation workflow failed: %s", e)
         initial_state["generation_status"] = GenerationStatus.FAILED.value
+        initial_state["generation_completed_at"] = datetime.now(timezone.utc).isoformat()
         initial_state["validation_errors"] = initial_state.get("validation_errors", []) + [{
             "agent": "workflow",
             "code": "WORKFLOW_ERROR",
@@ -766,7 +848,7 @@ async def run_generation_workflow(initial_state: BuilderState) -> BuilderState:
             "field": None,
             "severity": "error",
         }]
-        raise
+        return initial_state
 
 
 async def run_generation_workflow_streaming(initial_state: BuilderState):
@@ -784,14 +866,15 @@ async def run_generation_workflow_streaming(initial_state: BuilderState):
         create_progress_queue,
         remove_progress_queue,
         push_event,
+        push_events,
     )
 
     session_id = initial_state.get("session_id", "unknown")
-    logger.info(f"Starting streaming workflow for project: {initial_state.get('project_name')}")
+    logger.info("Starting streaming workflow for project: %s", initial_state.get("project_name"))
     
     # Set generation status
     initial_state["generation_status"] = GenerationStatus.IN_PROGRESS.value
-    initial_state["generation_started_at"] = datetime.utcnow().isoformat()
+    initial_state["generation_started_at"] = datetime.now(timezone.utc).isoformat()
     
     # Create the real-time progress queue
     queue = create_progress_queue(session_id)
@@ -799,17 +882,6 @@ async def run_generation_workflow_streaming(initial_state: BuilderState):
     # Get compiled graph
     graph = get_builder_graph()
     
-    # Agent order for emitting agent_start events (28 agents total)
-    AGENT_ORDER = [
-        "requirements", "enterprise_architecture", "domain_modeling", "data_modeling",
-        "db_migration", "integration", "service_exposure", "integration_design",
-        "error_handling", "audit_logging", "api_governance", "business_logic",
-        "ux_design", "fiori_ui", "security", "multitenancy", "i18n", "feature_flags",
-        "compliance_check", "extension", "performance_review", "ci_cd", "deployment",
-        "testing", "documentation", "observability", "project_assembly",
-        "project_verification", "validation",
-    ]
-    
     final_state: dict[str, Any] = {}
     workflow_error: Exception | None = None
     
@@ -817,12 +889,17 @@ async def run_generation_workflow_streaming(initial_state: BuilderState):
         """Run the LangGraph workflow in a background task."""
         nonlocal final_state, workflow_error
         try:
-            last_agent_idx = -1
             final_state = initial_state.copy()
             async for event in graph.astream(initial_state):
+                # Events for one step are queued together and share a timestamp
+                pending: list[dict[str, Any]] = []
+                timestamp = datetime.now(timezone.utc).isoformat()
                 for node_name, node_output in event.items():
                     # Update accumulated state with node output instead of overwriting
                     final_state.update(node_output)
+                    if node_name in CONCURRENT_PHASES:
+                        # run_agents_concurrently already reported each agent
+                        continue
                     node_state = node_output # Legacy reference for the rest of the loop
                     
                     # Emit agent_start for the NEXT agent if applicable
@@ -831,14 +908,15 @@ async def run_generation_workflow_streaming(initial_state: BuilderState):
                     
                     if latest and latest.get("status") in ["completed", "failed"]:
                         # Emit agent_complete
-                        await push_event(session_id, {
+                        pending.append({
                             "type": "agent_complete",
                             "agent": node_name,
                             "status": latest.get("status"),
                             "agent_history": agent_history,
                             "validation_errors": node_state.get("validation_errors", []),
-                            "timestamp": datetime.utcnow().isoformat(),
+                            "timestamp": timestamp,
                         })
+                push_events(session_id, pending)
             
             # Workflow completed successfully
             await push_event(session_id, {
@@ -848,18 +926,18 @@ async def run_generation_workflow_streaming(initial_state: BuilderState):
                 "agent_history": final_state.get("agent_history", []),
                 "validation_errors": final_state.get("validation_errors", []),
                 "final_state": final_state,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
             })
         except Exception as e:
             import traceback
             traceback.print_exc()
             workflow_error = e
-            logger.exception(f"Streaming workflow failed: {e}")
+            logger.exception("Streaming workflow failed: %s", e)
             await push_event(session_id, {
                 "type": "workflow_error",
                 "status": "failed",
                 "error": str(e),
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
             })
         finally:
             # Sentinel to signal the generator to stop
@@ -869,30 +947,33 @@ async def run_generation_workflow_streaming(initial_state: BuilderState):
     await push_event(session_id, {
         "type": "agent_start",
         "agent": AGENT_ORDER[0],
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
     })
     
+    async def _heartbeat():
+        """Keep-alive: prevent the SSE connection from timing out."""
+        while True:
+            await asyncio.sleep(SSE_HEARTBEAT_SECONDS)
+            push_events(session_id, [{
+                "type": "heartbeat",
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            }])
+
     # Start graph execution in the background
     task = asyncio.create_task(_run_graph())
+    heartbeat_task = asyncio.create_task(_heartbeat())
     
     try:
         # Yield events from the queue in real-time
         while True:
-            try:
-                event = await asyncio.wait_for(queue.get(), timeout=120.0)
-            except asyncio.TimeoutError:
-                # Keep-alive: prevent SSE connection from timing out
-                yield {
-                    "type": "heartbeat",
-                    "timestamp": datetime.utcnow().isoformat(),
-                }
-                continue
+            event = await queue.get()
             
             if event.get("type") == "_done":
                 break
             
             yield event
     finally:
+        heartbeat_task.cancel()
         remove_progress_queue(session_id)
         if not task.done():
             task.cancel()
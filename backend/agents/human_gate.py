@@ -17,10 +17,11 @@ SOLUTION for production: Replace in-memory events with Redis pub/sub:
 
 import asyncio
 import logging
+import os
 from datetime import datetime, timedelta
 from typing import Literal
 
-from backend.agents.state import BuilderState
+from backend.agents.state import BuilderState, GenerationStatus
 from backend.agents.progress import log_progress, push_event
 
 logger = logging.getLogger(__name__)
@@ -47,7 +48,6 @@ def get_gate_event(session_id: str, gate_id: str) -> asyncio.Event | None:
 
 def set_gate_decision(session_id: str, gate_id: str, decision: dict) -> None:
     """Store a gate decision."""
-    import os
     key = f"{session_id}:{gate_id}"
     _gate_decisions[key] = decision
     
@@ -214,7 +214,6 @@ async def human_gate(
     timeout_seconds = timeout_hours * 3600
     
     # BUG FIX #2: Add diagnostic logging for multi-process debugging
-    import os
     logger.info(f"[GATE DEBUG] {gate_id} waiting. needs_correction={state.get('needs_correction')}, "
                 f"correction_agent={state.get('correction_agent')}, worker_pid={os.getpid()}")
     
@@ -264,7 +263,6 @@ async def human_gate(
         # BUG FIX #4: Reset generation_status to COMPLETED if Gate 7 is approved
         # Gate 7 is the final release gate - if approved, the workflow should complete successfully
         if gate_id == "gate_7_final_release":
-            from backend.agents.state import GenerationStatus
             state["generation_status"] = GenerationStatus.COMPLETED.value
             logger.info(f"Gate 7 approved - setting generation_status to COMPLETED")
             
@@ -44,10 +44,26 @@ def load_knowledge(filename: str) -> str:
 
 from backend.knowledge.retriever import query_sap_knowledge
 
+# The agent getters below run a fixed query, so the retrieved block is the
+# same for every project. Cache it per process instead of re-embedding the
+# query and searching the vector store on every agent run. Empty results
+# are not cached, so a vector store ingested after startup is picked up.
+_rag_cache: dict[str, str] = {}
+
+
+def _query_knowledge(query: str) -> str:
+    """query_sap_knowledge for a fixed agent query, cached once non-empty."""
+    rag_content = _rag_cache.get(query)
+    if rag_content is None:
+        rag_content = query_sap_knowledge(query, k=5)
+        if rag_content:
+            _rag_cache[query] = rag_content
+    return rag_content
+
 def get_data_modeling_knowledge() -> str:
     """Get knowledge relevant to the data modeling agent."""
     query = "CDS schema definition syntax entities fields types associations compositions cuid managed"
-    rag_content = query_sap_knowledge(query, k=5)
+    rag_content = _query_knowledge(query)
     
     return f"""
 --- SAP CDS REFERENCE DOCUMENTATION (RAG Context) ---
@@ -59,7 +75,7 @@ def get_data_modeling_knowledge() -> str:
 def get_service_knowledge() -> str:
     """Get knowledge relevant to the service exposure agent."""
     query = "CDS service projection annotations OData actions functions @readonly @insertonly @UI"
-    rag_content = query_sap_knowledge(query, k=5)
+    rag_content = _query_knowledge(query)
     
     return f"""
 --- SAP ANNOTATION REFERENCE (RAG Context) ---
@@ -71,7 +87,7 @@ def get_service_knowledge() -> str:
 def get_business_logic_knowledge() -> str:
     """Get knowledge relevant to the business logic agent."""
     query = "SAP CAP Node.js handlers module.exports cds.service.impl this.on this.before this.after SELECT INSERT UPDATE DELETE srv/service.js"
-    rag_content = query_sap_knowledge(query, k=5)
+    rag_content = _query_knowledge(query)
     
     return f"""
 --- SAP CAP HANDLER REFERENCE (RAG Context) ---
@@ -83,7 +99,7 @@ def get_business_logic_knowledge() -> str:
 def get_fiori_knowledge() -> str:
     """Get knowledge relevant to the Fiori UI agent."""
     query = "SAP Fiori Elements manifest.json sap.app sap.ui5 dataSources routing FlexibleColumnLayout Component.js"
-    rag_content = query_sap_knowledge(query, k=5)
+    rag_content = _query_knowledge(query)
     
     return f"""
 --- SAP FIORI ELEMENTS REFERENCE (RAG Context) ---
@@ -95,7 +111,7 @@ def get_fiori_knowledge() -> str:
 def get_security_knowledge() -> str:
     """Get knowledge relevant to security and deployment agents."""
     query = "SAP BTP security xs-security.json XSUAA scopes role-templates @requires @restrict authorization"
-    rag_content = query_sap_knowledge(query, k=5)
+    rag_content = _query_knowledge(query)
     
     return f"""
 --- SAP SECURITY REFERENCE (RAG Context) ---
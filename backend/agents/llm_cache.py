@@ -0,0 +1,196 @@
+"""
+Local LLM Response Cache
+
+SQLite-backed store for parsed agent responses. Repeated generations with
+identical inputs (typical while iterating on the same project locally)
+short-circuit to the stored JSON instead of paying another LLM round trip.
+
+Opt-in via LLM_CACHE_ENABLED; entries expire after LLM_CACHE_TTL_SECONDS and
+the least recently used ones are evicted beyond LLM_CACHE_MAX_ENTRIES.
+Agents use the aget/aset wrappers so the sqlite I/O runs in a worker thread
+instead of blocking the event loop.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from typing import Any
+
+from backend.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class LLMResponseCache:
+    """Key/value store of parsed LLM responses with TTL and LRU eviction."""
+
+    def __init__(self, path: str, ttl_seconds: int = 86400, max_entries: int = 500):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(namespace: str, inputs: dict[str, Any]) -> str:
+        """Build a stable key from an agent name and its generation inputs."""
+        payload = json.dumps({"namespace": namespace, **inputs}, sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=20).hexdigest()
+
+    def get(self, key: str) -> dict | None:
+        """Return the cached response for ``key``, or None if missing/expired."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE llm_cache SET last_used = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            logger.warning(f"Discarding unreadable LLM cache entry {key}")
+            return None
+
+    def set(self, key: str, value: dict) -> None:
+        """Store ``value`` under ``key`` and evict the least recently used overflow."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now),
+            )
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE key NOT IN ("
+                " SELECT key FROM llm_cache ORDER BY last_used DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    async def aget(self, key: str) -> dict | None:
+        """Async get() that runs the lookup in a worker thread."""
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value: dict) -> None:
+        """Async set() that runs the write in a worker thread."""
+        await asyncio.to_thread(self.set, key, value)
+
+
+def _replace_strings(value: Any, pairs: list[tuple[str, str]]) -> Any:
+    """Apply ``pairs`` of (old, new) replacements to every string in ``value``."""
+    if isinstance(value, str):
+        for old, new in pairs:
+            value = value.replace(old, new)
+        return value
+    if isinstance(value, dict):
+        return {k: _replace_strings(v, pairs) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_replace_strings(v, pairs) for v in value]
+    return value
+
+
+def normalize_placeholders(value: Any, placeholders: dict[str, str]) -> Any:
+    """
+    Replace project-specific values with placeholders so near-duplicate
+    projects (same model, different name/namespace) share a cache entry.
+
+    Args:
+        value: String, dict or list to normalize
+        placeholders: Mapping of placeholder -> concrete value
+    """
+    # Longest first so a value that contains another is replaced whole
+    pairs = sorted(
+        ((concrete, placeholder) for placeholder, concrete in placeholders.items() if concrete),
+        key=lambda pair: len(pair[0]),
+        reverse=True,
+    )
+    return _replace_strings(value, pairs)
+
+
+def restore_placeholders(value: Any, placeholders: dict[str, str]) -> Any:
+    """Inverse of normalize_placeholders for a (possibly different) project."""
+    return _replace_strings(value, list(placeholders.items()))
+
+
+def _iter_strings(value: Any):
+    """Yield every string nested in ``value``."""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _iter_strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _iter_strings(item)
+
+
+def _appears_only_as_value(text: str, concrete: str) -> bool:
+    """
+    True when every occurrence of ``concrete`` in ``text`` reads as the
+    project value the prompt supplied: a whole token that is neither part of
+    a longer word, a JSON/YAML key nor a command argument (``npm test``).
+    """
+    escaped = re.escape(concrete)
+    if text.count(concrete) != len(re.findall(rf"(?<![A-Za-z0-9]){escaped}(?![A-Za-z0-9])", text)):
+        return False
+    as_key = rf"""(?:^|[\s{{,"'])(?:{escaped})["']?\s*:(?:\s|$)"""
+    as_command = rf"\b(?:npm|npx|yarn|pnpm|cds|mbt|cf)(?:\s+run)?\s+{escaped}(?![A-Za-z0-9])"
+    return not re.search(as_key, text, re.MULTILINE) and not re.search(as_command, text)
+
+
+def structural_entry(value: Any, placeholders: dict[str, str]) -> Any | None:
+    """
+    Normalized form of ``value`` for cross-project reuse, or None when it
+    cannot be restored safely.
+
+    Placeholders are swapped back in by plain string replacement, so a
+    project value that the response also uses as an ordinary word ("test",
+    "server") would rewrite unrelated text for the next project. The entry is
+    only produced when normalizing round-trips and each value appears solely
+    where the prompt put it.
+    """
+    normalized = normalize_placeholders(value, placeholders)
+    if restore_placeholders(normalized, placeholders) != value:
+        return None
+    for concrete in placeholders.values():
+        if concrete and not all(_appears_only_as_value(text, concrete) for text in _iter_strings(value)):
+            return None
+    return normalized
+
+
+# Global cache instance (created on first use when enabled)
+_llm_cache: LLMResponseCache | None = None
+
+
+def get_llm_cache() -> LLMResponseCache | None:
+    """Get the global response cache, or None when caching is disabled."""
+    global _llm_cache
+    settings = get_settings()
+    if not settings.llm_cache_enabled:
+        return None
+    if _llm_cache is None:
+        _llm_cache = LLMResponseCache(
+            settings.llm_cache_path,
+            ttl_seconds=settings.llm_cache_ttl_seconds,
+            max_entries=settings.llm_cache_max_entries,
+        )
+    return _llm_cache
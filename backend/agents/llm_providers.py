@@ -4,7 +4,9 @@ Multi-LLM Provider Abstraction Layer.
 Supports OpenAI-compatible and native providers used by the builder.
 """
 
+import asyncio
 import logging
+import weakref
 from abc import ABC, abstractmethod
 from typing import Any, AsyncGenerator
 
@@ -19,6 +21,15 @@ logger = logging.getLogger(__name__)
 
 class LLMProvider(ABC):
     """Abstract base class for LLM providers."""
+
+    # Whether the endpoint accepts explicit ``cache_control`` markers on
+    # message content blocks. Providers without it still benefit from
+    # automatic prefix caching as long as the system prompt is sent first.
+    supports_cache_control: bool = False
+
+    # Whether the endpoint accepts ``response_format={"type": "json_object"}``
+    # so the model is constrained to a bare JSON object
+    supports_json_mode: bool = False
     
     @property
     @abstractmethod
@@ -40,9 +51,33 @@ class LLMProvider(ABC):
         """Generate a response from messages."""
         pass
 
+    async def stream(
+        self,
+        messages: list[BaseMessage],
+        **kwargs,
+    ) -> AsyncGenerator[str, None]:
+        """Stream a response from messages as text chunks."""
+        model = self.get_chat_model(**kwargs)
+        logger.info(f"LLM Streaming: provider={self.name}, model={self.model}")
+        async for chunk in model.astream(messages):
+            if chunk.content:
+                yield str(chunk.content)
+
+    def _log_cache_usage(self, response: Any) -> None:
+        """Log how much of the prompt the provider served from its prefix cache."""
+        usage = getattr(response, "usage_metadata", None) or {}
+        cache_read = (usage.get("input_token_details") or {}).get("cache_read")
+        if cache_read:
+            logger.info(
+                f"LLM prompt cache: provider={self.name}, "
+                f"cache_read_input_tokens={cache_read}/{usage.get('input_tokens', '?')}"
+            )
+
 
 class OpenAIProvider(LLMProvider):
     """OpenAI GPT-4 provider."""
+
+    supports_json_mode = True
     
     @property
     def name(self) -> str:
@@ -67,6 +102,7 @@ class OpenAIProvider(LLMProvider):
         model = self.get_chat_model(**kwargs)
         logger.info(f"LLM Generation: provider={self.name}, model={self.model}")
         response = await model.ainvoke(messages)
+        self._log_cache_usage(response)
         return str(response.content)
 
 
@@ -102,11 +138,14 @@ class GeminiProvider(LLMProvider):
         model = self.get_chat_model(**kwargs)
         logger.info(f"LLM Generation: provider={self.name}, model={self.model}")
         response = await model.ainvoke(messages)
+        self._log_cache_usage(response)
         return str(response.content)
 
 
 class DeepSeekProvider(LLMProvider):
     """DeepSeek provider (OpenAI-compatible API)."""
+
+    supports_json_mode = True
     
     @property
     def name(self) -> str:
@@ -134,11 +173,14 @@ class DeepSeekProvider(LLMProvider):
         model = self.get_chat_model(**kwargs)
         logger.info(f"LLM Generation: provider={self.name}, model={self.model}")
         response = await model.ainvoke(messages)
+        self._log_cache_usage(response)
         return str(response.content)
 
 
 class KimiProvider(LLMProvider):
     """Kimi (Moonshot) K2.5 provider (OpenAI-compatible API)."""
+
+    supports_json_mode = True
     
     @property
     def name(self) -> str:
@@ -164,12 +206,15 @@ class KimiProvider(LLMProvider):
     async def generate(self, messages: list[BaseMessage], **kwargs) -> str:
         model = self.get_chat_model(**kwargs)
         response = await model.ainvoke(messages)
+        self._log_cache_usage(response)
         return str(response.content)
 
 
 class XAIProvider(LLMProvider):
     """xAI Grok provider (OpenAI-compatible API)."""
 
+    supports_json_mode = True
+
     @property
     def name(self) -> str:
         return "xai"
@@ -195,12 +240,15 @@ class XAIProvider(LLMProvider):
         model = self.get_chat_model(**kwargs)
         logger.info(f"LLM Generation: provider={self.name}, model={self.model}")
         response = await model.ainvoke(messages)
+        self._log_cache_usage(response)
         return str(response.content)
 
 
 class OpenRouterProvider(LLMProvider):
     """OpenRouter provider (OpenAI-compatible API)."""
 
+    supports_cache_control = True
+
     @property
     def name(self) -> str:
         return "openrouter"
@@ -230,6 +278,7 @@ class OpenRouterProvider(LLMProvider):
         model = self.get_chat_model(**kwargs)
         logger.info(f"LLM Generation: provider={self.name}, model={self.model}")
         response = await model.ainvoke(messages)
+        self._log_cache_usage(response)
         return str(response.content)
 
 
@@ -242,8 +291,22 @@ class LLMManager:
     def __init__(self):
         self.settings = get_settings()
         self._providers: dict[str, LLMProvider] = {}
+        # Caps requests in flight across concurrently running agents so the
+        # provider's rate limits are respected; one semaphore per event loop
+        self._semaphores: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+            weakref.WeakKeyDictionary()
+        )
         self._initialize_providers()
     
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Concurrency limit for the running event loop, created on first use."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(max(1, self.settings.llm_max_concurrency))
+            self._semaphores[loop] = semaphore
+        return semaphore
+
     def _initialize_providers(self) -> None:
         """Initialize available providers based on API keys."""
         if self.settings.openai_api_key:
@@ -343,6 +406,8 @@ class LLMManager:
         prompt: str,
         system_prompt: str | None = None,
         provider: str | None = None,
+        cache_system_prompt: bool = False,
+        json_mode: bool = False,
         **kwargs,
     ) -> str:
         """
@@ -352,19 +417,75 @@ class LLMManager:
             prompt: User prompt
             system_prompt: Optional system prompt
             provider: Provider name (optional)
+            cache_system_prompt: Mark the system prompt as a cacheable prefix
+                on providers that accept explicit cache markers
+            json_mode: Request a bare JSON object response on providers that
+                support it; ignored elsewhere
             **kwargs: Additional generation parameters
             
         Returns:
             Generated text response
         """
+        llm_provider = self.get_provider(provider)
+        messages = self._build_messages(llm_provider, prompt, system_prompt, cache_system_prompt)
+        if json_mode:
+            kwargs = self._with_json_mode(llm_provider, kwargs)
+        async with self._get_semaphore():
+            return await llm_provider.generate(messages, **kwargs)
+
+    async def stream(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        provider: str | None = None,
+        cache_system_prompt: bool = False,
+        json_mode: bool = False,
+        **kwargs,
+    ) -> AsyncGenerator[str, None]:
+        """
+        Stream a response using the specified provider.
+
+        Same arguments as generate(); yields text chunks as they arrive.
+        The concurrency slot is held until the stream ends, so consumers
+        that may stop early should iterate under contextlib.aclosing().
+        """
+        llm_provider = self.get_provider(provider)
+        messages = self._build_messages(llm_provider, prompt, system_prompt, cache_system_prompt)
+        if json_mode:
+            kwargs = self._with_json_mode(llm_provider, kwargs)
+        async with self._get_semaphore():
+            async for chunk in llm_provider.stream(messages, **kwargs):
+                yield chunk
+
+    @staticmethod
+    def _with_json_mode(llm_provider: LLMProvider, kwargs: dict[str, Any]) -> dict[str, Any]:
+        """Add the JSON response format to the model kwargs when supported."""
+        if not llm_provider.supports_json_mode:
+            return kwargs
+        model_kwargs = {**kwargs.get("model_kwargs", {}), "response_format": {"type": "json_object"}}
+        return {**kwargs, "model_kwargs": model_kwargs}
+
+    @staticmethod
+    def _build_messages(
+        llm_provider: LLMProvider,
+        prompt: str,
+        system_prompt: str | None,
+        cache_system_prompt: bool,
+    ) -> list[BaseMessage]:
+        """Build the system + user message list for a request."""
         messages: list[BaseMessage] = []
         
         if system_prompt:
-            messages.append(SystemMessage(content=system_prompt))
+            if cache_system_prompt and llm_provider.supports_cache_control:
+                messages.append(SystemMessage(content=[{
+                    "type": "text",
+                    "text": system_prompt,
+                    "cache_control": {"type": "ephemeral"},
+                }]))
+            else:
+                messages.append(SystemMessage(content=system_prompt))
         messages.append(HumanMessage(content=prompt))
-        
-        llm_provider = self.get_provider(provider)
-        return await llm_provider.generate(messages, **kwargs)
+        return messages
 
 
 # Global LLM manager instance
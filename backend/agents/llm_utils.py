@@ -12,7 +12,9 @@ import json
 import logging
 import asyncio
 import random
-from typing import Any
+import re
+from contextlib import aclosing
+from typing import Any, Callable
 
 from backend.agents.llm_providers import get_llm_manager
 from backend.agents.state import BuilderState
@@ -21,11 +23,44 @@ from backend.agents.model_router import get_model_for_agent, get_model_tier_name
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+except ImportError:  # optional speedup, stdlib json is used otherwise
+    orjson = None
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def json_dumps_indented(value: Any) -> str:
+    """Equivalent of json.dumps(value, indent=2), using orjson when installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_INDENT_2).decode()
+        except TypeError:
+            pass  # not natively serializable by orjson; let stdlib try
+    return json.dumps(value, indent=2)
+
+
+def json_dumps_compact(value: Any) -> str:
+    """Whitespace-free JSON for embedding data in prompts, using orjson when installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value).decode()
+        except TypeError:
+            pass  # not natively serializable by orjson; let stdlib try
+    return json.dumps(value, separators=(",", ":"))
+
 
 # =============================================================================
 # Robust JSON Parsing
 # =============================================================================
 
+# <think>...</think> blocks emitted by reasoning models (e.g. Deepseek)
+_THINK_TAG_RE = re.compile(r"<think>.*?</think>", re.DOTALL)
+
+_JSON_DECODER = json.JSONDecoder()
+
+
 def parse_llm_json(response_text: str) -> dict | None:
     """
     Robustly parse JSON from LLM response.
@@ -35,14 +70,15 @@ def parse_llm_json(response_text: str) -> dict | None:
         return None
 
     text = response_text.strip()
-    
-    # Strip <think>...</think> tags which are generated by Deepseek reasoning models
-    import re
-    text = re.sub(r'<think>.*?</think>', '', text, flags=re.DOTALL).strip()
+
+    # Strip reasoning blocks only when present; a bare JSON object (the
+    # common case) goes straight to the direct parse
+    if not (text.startswith("{") and text.endswith("}")) and "<think>" in text:
+        text = _THINK_TAG_RE.sub("", text).strip()
 
     # 1. Try direct parse
     try:
-        return json.loads(text)
+        return _json_loads(text)
     except json.JSONDecodeError as e:
         logger.debug(f"Direct JSON parse failed: {e}")
 
@@ -50,19 +86,29 @@ def parse_llm_json(response_text: str) -> dict | None:
     try:
         if "```json" in text:
             json_str = text.split("```json", 1)[1].split("```", 1)[0].strip()
-            return json.loads(json_str)
+            return _json_loads(json_str)
         elif "```" in text:
             json_str = text.split("```", 1)[1].split("```", 1)[0].strip()
-            return json.loads(json_str)
+            return _json_loads(json_str)
     except (json.JSONDecodeError, IndexError) as e:
         logger.debug(f"Markdown fence extraction failed: {e}")
 
-    # 3. Find first { ... last }
+    # 3. Decode the first complete object and ignore whatever follows it
+    start = text.find("{")
+    if start != -1:
+        try:
+            value, _ = _JSON_DECODER.raw_decode(text, start)
+            if isinstance(value, dict):
+                return value
+        except json.JSONDecodeError as e:
+            logger.debug(f"Object scan failed: {e}")
+
+    # 4. Find first { ... last }
     try:
         start = text.index("{")
         end = text.rindex("}") + 1
         json_str = text[start:end]
-        return json.loads(json_str)
+        return _json_loads(json_str)
     except (ValueError, json.JSONDecodeError) as e:
         logger.debug(f"Bracket extraction failed: {e}")
         # Log first 500 chars of problematic response for debugging
@@ -71,6 +117,109 @@ def parse_llm_json(response_text: str) -> dict | None:
     return None
 
 
+class IncrementalJSONObject:
+    """
+    Decode the top-level members of a JSON object while it is streamed.
+
+    feed() returns the (key, value) pairs completed by the new chunk, so
+    callers can act on large members before the rest of the response
+    arrives. Text before the opening brace (e.g. a code fence) is skipped.
+    The full response should still go through parse_llm_json at the end.
+
+    Each character is scanned once to find where the current member ends
+    (a top-level comma or closing brace outside any string); only then is
+    the member decoded, so feeding stays linear in the response length.
+    """
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._started = False
+        # Scanner state for the member currently in the buffer
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self.done = False
+
+    def feed(self, chunk: str) -> list[tuple[str, Any]]:
+        items: list[tuple[str, Any]] = []
+        if self.done:
+            return items
+        self._buffer += chunk
+
+        if not self._started:
+            if "<think>" in self._buffer and "</think>" not in self._buffer:
+                return items
+            start = self._buffer.find("{", self._buffer.rfind("</think>") + 1)
+            if start == -1:
+                return items
+            self._buffer = self._buffer[start + 1:]
+            self._started = True
+
+        buffer = self._buffer
+        i = self._pos
+        while i < len(buffer):
+            c = buffer[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+            elif c == '"':
+                self._in_string = True
+            elif c in "{[":
+                self._depth += 1
+            elif c in "}]" and self._depth:
+                self._depth -= 1
+            elif c in ",}":
+                # End of a top-level member
+                try:
+                    member = self._decode_member(buffer[:i])
+                except ValueError:
+                    # Not an object member; leave it to the full parse
+                    self.done = True
+                    break
+                if member is not None:
+                    items.append(member)
+                if c == "}":
+                    self.done = True
+                if self.done:
+                    break
+                buffer = buffer[i + 1:]
+                i = 0
+                continue
+            i += 1
+
+        # Keep only the unconsumed tail so appends stay cheap
+        self._buffer = buffer
+        self._pos = i
+        return items
+
+    def _decode_member(self, text: str) -> tuple[str, Any] | None:
+        """
+        Decode one ``"key": value`` member, or None for empty text.
+
+        Raises:
+            ValueError: If ``text`` is not a single object member
+        """
+        text = text.strip()
+        if not text:
+            return None
+        decode = self._decoder.raw_decode
+        key, end = decode(text)
+        rest = text[end:].lstrip()
+        if not isinstance(key, str) or not rest.startswith(":"):
+            raise ValueError("expected an object member")
+        value_text = rest[1:].lstrip()
+        value, end = decode(value_text)
+        if value_text[end:].strip():
+            raise ValueError("unexpected text after member value")
+        return key, value
+
+
 # =============================================================================
 # LLM Generation with Retry and Self-Healing
 # =============================================================================
@@ -82,6 +231,10 @@ async def generate_with_retry(
     required_keys: list[str] | None = None,
     max_retries: int = 5,
     agent_name: str = "agent",
+    cache_system_prompt: bool = False,
+    on_item: Callable[[str, Any], None] | None = None,
+    temperature: float | None = None,
+    json_mode: bool = False,
 ) -> dict | None:
     """
     Call LLM with retry logic and self-healing.
@@ -96,6 +249,14 @@ async def generate_with_retry(
         required_keys: Keys that must be present in the JSON response
         max_retries: Maximum number of retry attempts
         agent_name: Name of the calling agent (for logging)
+        cache_system_prompt: Ask the provider to cache the static system
+            prompt so retries and later runs reuse it
+        on_item: Optional callback; when given the response is streamed and
+            called with each top-level (key, value) as soon as it is complete
+        temperature: Fixed sampling temperature for every attempt; defaults
+            to 0.1 on the first attempt and 0.05 on retries
+        json_mode: Ask providers that support it to return a bare JSON
+            object, so responses parse on the first try
 
     Returns:
         Parsed JSON dict or None if all attempts fail
@@ -128,13 +289,28 @@ async def generate_with_retry(
     for attempt in range(max_retries):
         try:
             # Use the user's selected model - NO OVERRIDE
-            response = await llm_manager.generate(
+            request = dict(
                 prompt=current_prompt,
                 system_prompt=system_prompt,
                 provider=provider,
+                cache_system_prompt=cache_system_prompt,
+                json_mode=json_mode,
                 model=user_model,  # Pass user's model directly
-                temperature=0.1 if attempt == 0 else 0.05,
+                temperature=temperature if temperature is not None else (0.1 if attempt == 0 else 0.05),
             )
+            if on_item is None:
+                response = await llm_manager.generate(**request)
+            else:
+                chunks: list[str] = []
+                decoder = IncrementalJSONObject()
+                # Close the stream even if on_item raises or the task is
+                # cancelled, so its concurrency slot is released right away
+                async with aclosing(llm_manager.stream(**request)) as stream:
+                    async for chunk in stream:
+                        chunks.append(chunk)
+                        for key, value in decoder.feed(chunk):
+                            on_item(key, value)
+                response = "".join(chunks)
 
             parsed = parse_llm_json(response)
 
@@ -355,3 +531,17 @@ def store_generated_content(state: BuilderState, artifacts: list, key_map: dict[
             if pattern in path:
                 state[state_key] = content
                 break
+
+
+def merge_artifacts(existing: list, artifacts: list) -> list:
+    """
+    Merge newly generated artifacts into an existing artifact list by path.
+
+    A regenerated file replaces its earlier version in place instead of
+    being appended again, so retries and self-healing passes do not leave
+    duplicates for validation and assembly to scan.
+    """
+    by_path = {artifact["path"]: artifact for artifact in existing}
+    for artifact in artifacts:
+        by_path[artifact["path"]] = artifact
+    return list(by_path.values())
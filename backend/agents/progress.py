@@ -7,6 +7,7 @@ The SSE endpoint reads from this queue to stream live updates to the frontend.
 
 import asyncio
 import logging
+from datetime import datetime, timezone
 from typing import Any
 
 logger = logging.getLogger(__name__)
@@ -17,12 +18,16 @@ logger = logging.getLogger(__name__)
 _queues: dict[str, asyncio.Queue] = {}
 _started_agents: dict[str, set[str]] = {}
 
+# Events buffered per session before the oldest are dropped, so a stalled
+# client cannot grow the queue without bound or block the agents
+PROGRESS_QUEUE_MAXSIZE = 2048
+
 
 def create_progress_queue(session_id: str) -> asyncio.Queue:
     """Create and register a progress queue for a session."""
-    q: asyncio.Queue = asyncio.Queue()
+    q: asyncio.Queue = asyncio.Queue(maxsize=PROGRESS_QUEUE_MAXSIZE)
     _queues[session_id] = q
-    logger.info(f"Progress queue created for session {session_id}")
+    logger.info("Progress queue created for session %s", session_id)
     return q
 
 
@@ -35,14 +40,32 @@ def remove_progress_queue(session_id: str) -> None:
     """Remove and clean up a session's progress queue."""
     _queues.pop(session_id, None)
     _started_agents.pop(session_id, None)
-    logger.info(f"Progress queue removed for session {session_id}")
+    logger.info("Progress queue removed for session %s", session_id)
+
+
+def _put_dropping_oldest(q: asyncio.Queue, event: dict[str, Any]) -> None:
+    """Enqueue without blocking; when full, drop the oldest event to make room."""
+    try:
+        q.put_nowait(event)
+    except asyncio.QueueFull:
+        dropped = q.get_nowait()
+        logger.warning("Progress queue full; dropped %s event", dropped.get("type"))
+        q.put_nowait(event)
 
 
 async def push_event(session_id: str, event: dict[str, Any]) -> None:
     """Push an event into the session's progress queue (non-blocking)."""
     q = _queues.get(session_id)
     if q is not None:
-        await q.put(event)
+        _put_dropping_oldest(q, event)
+
+
+def push_events(session_id: str, events: list[dict[str, Any]]) -> None:
+    """Push several events into the session's progress queue at once."""
+    q = _queues.get(session_id)
+    if q is not None:
+        for event in events:
+            _put_dropping_oldest(q, event)
 
 
 def log_progress(state: dict, message: str) -> None:
@@ -52,20 +75,61 @@ def log_progress(state: dict, message: str) -> None:
     - Appends to state["current_logs"] (for LangGraph state tracking)
     - Pushes an SSE event into the session's asyncio Queue (for real-time streaming)
     """
-    from datetime import datetime
+    _emit_progress(state, [message])
+
+
+class ProgressBuffer:
+    """
+    Collect progress messages and emit them as a single agent_log event.
+
+    Use around stretches of an agent that produce several messages in a
+    row; call flush() before a long await so the frontend still sees what
+    is happening. Remaining messages are flushed when the block exits.
+
+        with ProgressBuffer(state) as progress:
+            progress.add("Starting...")
+            progress.flush()
+            await long_call()
+            progress.add("Done.")
+    """
+
+    def __init__(self, state: dict):
+        self.state = state
+        self._messages: list[str] = []
+
+    def __enter__(self) -> "ProgressBuffer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.flush()
+
+    def add(self, message: str) -> None:
+        """Queue a message for the next flush."""
+        self._messages.append(message)
+
+    def flush(self) -> None:
+        """Emit all queued messages as one event."""
+        if self._messages:
+            messages, self._messages = self._messages, []
+            _emit_progress(self.state, messages)
+
 
+def _emit_progress(state: dict, messages: list[str]) -> None:
+    """Record messages in state and push them as one SSE event."""
     # Append to state logs (LangGraph state)
     if "current_logs" not in state:
         state["current_logs"] = []
-    state["current_logs"].append(message)
+    state["current_logs"].extend(messages)
 
+    message = "\n".join(messages)
     agent_name = state.get("current_agent", "agent")
-    logger.info(f"[{agent_name}] {message}")
+    logger.info("[%s] %s", agent_name, message)
 
     # Push into the real-time queue (fire-and-forget via event loop)
     session_id = state.get("session_id", "")
     q = _queues.get(session_id)
     if q is not None:
+        timestamp = datetime.now(timezone.utc).isoformat()
         try:
             # Emit agent_start if this is the first log for this agent in this session
             if session_id not in _started_agents:
@@ -73,17 +137,17 @@ def log_progress(state: dict, message: str) -> None:
             
             if agent_name not in _started_agents[session_id]:
                 _started_agents[session_id].add(agent_name)
-                q.put_nowait({
+                _put_dropping_oldest(q, {
                     "type": "agent_start",
                     "agent": agent_name,
-                    "timestamp": datetime.utcnow().isoformat(),
+                    "timestamp": timestamp,
                 })
 
-            q.put_nowait({
+            _put_dropping_oldest(q, {
                 "type": "agent_log",
                 "agent": agent_name,
                 "message": message,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": timestamp,
             })
         except Exception:
             pass  # queue full or loop closed — not critical
@@ -7,11 +7,14 @@ can be inspected, built, and validated like an actual CAP/Fiori project.
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 from datetime import datetime
 from pathlib import Path
 
+import aiofiles
+
 from backend.agents.progress import log_progress
 from backend.agents.state import BuilderState, GeneratedFile
 from backend.config import get_settings
@@ -19,6 +22,26 @@ from backend.config import get_settings
 logger = logging.getLogger(__name__)
 
 
+OPERATIONS_RUNBOOK = """# Operations Runbook
+
+## Production Readiness Checklist
+- Review destinations and XSUAA bindings
+- Validate CAP service build in CI
+- Review generated roles and tenant configuration
+- Review monitoring, logging, and backup strategy"""
+
+
+# Upper bound on files open at once while materializing the workspace
+_MAX_CONCURRENT_WRITES = 32
+
+
+async def _write_artifact(target: Path, content: str, write_slots: asyncio.Semaphore) -> None:
+    async with write_slots:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        async with aiofiles.open(target, "w", encoding="utf-8") as handle:
+            await handle.write(content)
+
+
 def _slugify(value: str) -> str:
     slug = "".join(char.lower() if char.isalnum() else "-" for char in value)
     while "--" in slug:
@@ -93,56 +116,43 @@ def _ensure_essential_artifacts(state: BuilderState) -> None:
         _append_artifact(state, "artifacts_deployment", "package.json", package_json, "json")
 
     if "mta.yaml" not in all_paths:
-        mta_yaml = "\n".join([
-            "_schema-version: '3.3.0'",
-            f"ID: {project_slug}",
-            "version: 1.0.0",
-            "modules:",
-            "  - name: srv",
-            "    type: nodejs",
-            "    path: gen/srv",
-            "  - name: db-deployer",
-            "    type: hdb",
-            "    path: gen/db",
-            "  - name: approuter",
-            "    type: approuter.nodejs",
-            "    path: app/router",
-            "resources:",
-            "  - name: xsuaa",
-            "    type: org.cloudfoundry.managed-service",
-            "    parameters:",
-            "      service: xsuaa",
-            "      service-plan: application",
-        ])
+        mta_yaml = f"""_schema-version: '3.3.0'
+ID: {project_slug}
+version: 1.0.0
+modules:
+  - name: srv
+    type: nodejs
+    path: gen/srv
+  - name: db-deployer
+    type: hdb
+    path: gen/db
+  - name: approuter
+    type: approuter.nodejs
+    path: app/router
+resources:
+  - name: xsuaa
+    type: org.cloudfoundry.managed-service
+    parameters:
+      service: xsuaa
+      service-plan: application"""
         _append_artifact(state, "artifacts_deployment", "mta.yaml", mta_yaml, "yaml")
 
     if "README.md" not in all_paths:
-        readme = "\n".join([
-            f"# {project_name}",
-            "",
-            "Generated enterprise SAP CAP + Fiori project.",
-            "",
-            "## Modules",
-            "- Database model under `db/`",
-            "- CAP services under `srv/`",
-            "- Fiori applications under `app/`",
-            "- Security and deployment descriptors at project root",
-            "",
-            f"Namespace: `{namespace}`",
-        ])
+        readme = f"""# {project_name}
+
+Generated enterprise SAP CAP + Fiori project.
+
+## Modules
+- Database model under `db/`
+- CAP services under `srv/`
+- Fiori applications under `app/`
+- Security and deployment descriptors at project root
+
+Namespace: `{namespace}`"""
         _append_artifact(state, "artifacts_docs", "README.md", readme, "md")
 
     if "docs/OPERATIONS_RUNBOOK.md" not in all_paths:
-        runbook = "\n".join([
-            "# Operations Runbook",
-            "",
-            "## Production Readiness Checklist",
-            "- Review destinations and XSUAA bindings",
-            "- Validate CAP service build in CI",
-            "- Review generated roles and tenant configuration",
-            "- Review monitoring, logging, and backup strategy",
-        ])
-        _append_artifact(state, "artifacts_docs", "docs/OPERATIONS_RUNBOOK.md", runbook, "md")
+        _append_artifact(state, "artifacts_docs", "docs/OPERATIONS_RUNBOOK.md", OPERATIONS_RUNBOOK, "md")
 
 
 async def project_assembly_agent(state: BuilderState) -> BuilderState:
@@ -166,14 +176,13 @@ async def project_assembly_agent(state: BuilderState) -> BuilderState:
     workspace = (Path(settings.artifacts_path) / "generated" / session_id / project_slug).resolve()
     workspace.mkdir(parents=True, exist_ok=True)
 
-    written_files = []
-    for artifact in artifacts:
-        relative_path = artifact["path"]
-        content = artifact.get("content", "")
-        target = workspace / relative_path
-        target.parent.mkdir(parents=True, exist_ok=True)
-        target.write_text(content, encoding="utf-8")
-        written_files.append(relative_path)
+    # Write all artifacts concurrently instead of one blocking write at a time
+    written_files = [artifact["path"] for artifact in artifacts]
+    write_slots = asyncio.Semaphore(_MAX_CONCURRENT_WRITES)
+    await asyncio.gather(*(
+        _write_artifact(workspace / artifact["path"], artifact.get("content", ""), write_slots)
+        for artifact in artifacts
+    ))
 
     manifest_path = workspace / "docs" / "GENERATION_MANIFEST.json"
     manifest_path.parent.mkdir(parents=True, exist_ok=True)
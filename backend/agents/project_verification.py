@@ -179,8 +179,11 @@ async def project_verification_agent(state: BuilderState) -> BuilderState:
             "details": detail,
         })
 
-    checks.append(await _run_optional_command(workspace, ["node", "--version"], "Node runtime availability"))
-    checks.append(await _run_optional_command(workspace, ["npm", "--version"], "NPM availability"))
+    # Independent toolchain probes; run them side by side
+    checks.extend(await asyncio.gather(
+        _run_optional_command(workspace, ["node", "--version"], "Node runtime availability"),
+        _run_optional_command(workspace, ["npm", "--version"], "NPM availability"),
+    ))
 
     report = _build_report(state.get("project_name", "App"), workspace, checks)
     report_path = workspace / "docs" / "VERIFICATION_REPORT.md"
@@ -18,6 +18,7 @@ from typing import Any
 from langchain_core.messages import HumanMessage, SystemMessage
 
 from backend.agents.llm_providers import get_llm_manager
+from backend.agents.llm_utils import get_complexity_prompt, parse_llm_json
 from backend.agents.state import (
     BuilderState,
     EntityDefinition,
@@ -38,52 +39,6 @@ logger = logging.getLogger(__name__)
 from backend.agents.progress import log_progress
 
 
-# =============================================================================
-# JSON Parsing Utility
-# =============================================================================
-
-def _parse_llm_json(response_text: str) -> dict | None:
-    """
-    Robustly parse JSON from LLM response.
-    Handles markdown code fences, extra text, and common formatting issues.
-    """
-    if not response_text:
-        return None
-
-    text = response_text.strip()
-    
-    # Strip <think>...</think> tags which are generated by Deepseek reasoning models
-    import re
-    text = re.sub(r'<think>.*?</think>', '', text, flags=re.DOTALL).strip()
-
-    # 1. Try direct parse
-    try:
-        return json.loads(text)
-    except json.JSONDecodeError:
-        pass
-
-    # 2. Extract from markdown code fence
-    try:
-        if "```json" in text:
-            json_str = text.split("```json", 1)[1].split("```", 1)[0].strip()
-            return json.loads(json_str)
-        elif "```" in text:
-            json_str = text.split("```", 1)[1].split("```", 1)[0].strip()
-            return json.loads(json_str)
-    except (json.JSONDecodeError, IndexError):
-        pass
-
-    # 3. Find first { ... last }
-    try:
-        start = text.index("{")
-        end = text.rindex("}") + 1
-        return json.loads(text[start:end])
-    except (ValueError, json.JSONDecodeError):
-        pass
-
-    return None
-
-
 # =============================================================================
 # System Prompt — Comprehensive Requirements Architect
 # =============================================================================
@@ -390,8 +345,6 @@ async def _generate_with_retry(
     Call LLM with retry logic and self-healing.
     If JSON parsing fails, feeds the error back to the LLM.
     """
-    from backend.agents.llm_utils import get_complexity_prompt
-    
     llm_manager = get_llm_manager()
     last_error = None
 
@@ -416,7 +369,7 @@ async def _generate_with_retry(
                 temperature=0.1 if attempt == 0 else 0.05,  # Lower temp on retries
             )
 
-            parsed = _parse_llm_json(response)
+            parsed = parse_llm_json(response)
 
             if parsed and isinstance(parsed, dict):
                 # Basic structural validation
@@ -57,6 +57,9 @@ OUTPUT FORMAT:
 Return ONLY valid JSON."""
 
 
+_XSAPPNAME_TRANSLATION = str.maketrans({" ": "-", "_": "-"})
+
+
 SECURITY_GENERATION_PROMPT = """Generate security configurations for this SAP CAP application.
 
 Project: {project_name}
@@ -92,7 +95,7 @@ async def security_agent(state: BuilderState) -> BuilderState:
     project_name = state.get("project_name", "App")
     namespace = state.get("project_namespace", "com.company.app")
     auth_type = state.get("auth_type", "mock")
-    xsappname = project_name.lower().replace(" ", "-").replace("_", "-")
+    xsappname = project_name.lower().translate(_XSAPPNAME_TRANSLATION)
 
     service_context = get_service_context(state)
     knowledge = get_security_knowledge()
@@ -191,6 +191,10 @@ Return a JSON object:
 Return ONLY the JSON."""
 
 
+_WORD_SEPARATOR_TRANSLATION = str.maketrans("-_", "  ")
+_SERVICE_PATH_TRANSLATION = str.maketrans(" ", "-")
+
+
 SERVICE_GENERATION_PROMPT = """Generate a complete SAP CAP service definition and Fiori annotations.
 
 Project Name: {project_name}
@@ -275,10 +279,10 @@ async def service_exposure_agent(state: BuilderState) -> BuilderState:
     # Build service name
     service_name = "".join(
         word.capitalize()
-        for word in project_name.replace("-", " ").replace("_", " ").split()
+        for word in project_name.translate(_WORD_SEPARATOR_TRANSLATION).split()
     )
     service_name = f"{service_name}Service"
-    service_path = project_name.lower().replace(" ", "-")
+    service_path = project_name.lower().translate(_SERVICE_PATH_TRANSLATION)
 
     # Get inter-agent context
     schema_context = get_schema_context(state)
@@ -5,7 +5,7 @@ Defines the global state passed between all agents in the workflow.
 
 from datetime import datetime
 from enum import Enum
-from typing import Any, TypedDict, Literal
+from typing import Any, Literal, NamedTuple, TypedDict
 
 
 # =============================================================================
@@ -214,6 +214,12 @@ class GeneratedFile(TypedDict):
     file_type: str
 
 
+class ArtifactSpec(NamedTuple):
+    """Static target of a generated file: where it goes and what it is."""
+    path: str
+    file_type: str
+
+
 class ValidationError(TypedDict):
     """Validation error details."""
     agent: str
@@ -422,6 +428,8 @@ class BuilderState(TypedDict, total=False):
     validation_retry_count: int          # Number of self-healing correction loops completed
     correction_agent: str | None         # Agent to route back to for correction
     correction_context: dict | None      # { "issues": [...], "correction_prompt": "..." }
+    validation_artifacts_digest: str | None  # Hash of the artifact set last validated
+    validation_llm_results: list[ValidationError] | None  # LLM findings for that artifact set
 
     # -------------------------------------------------------------------------
     # LLM Provider
@@ -530,6 +538,8 @@ def create_initial_state(
         validation_retry_count=0,
         correction_agent=None,
         correction_context=None,
+        validation_artifacts_digest=None,
+        validation_llm_results=None,
         agent_failed=False,
         MAX_RETRIES=5,
         retry_counts={},
@@ -8,9 +8,13 @@ correction prompts so the graph can route back for self-healing.
 Uses LLM for holistic validation + rule-based structural checks.
 """
 
+import asyncio
+import hashlib
 import logging
 import json
 import re
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from typing import Any
 
@@ -28,6 +32,9 @@ from backend.rag.rule_extractor import check_all_rules, get_all_rules
 logger = logging.getLogger(__name__)
 
 
+COMPLIANCE_REPORT_PATH = "docs/COMPLIANCE_REPORT.md"
+
+
 # =============================================================================
 # System Prompts for LLM
 # =============================================================================
@@ -305,6 +312,49 @@ def validate_artifact(artifact: GeneratedFile) -> list[ValidationError]:
     return []
 
 
+# Rule-based errors per (path, content digest, file_type), least recently
+# used first. Only the error tuples are kept, not the file contents.
+_ARTIFACT_ERRORS_MAX_ENTRIES = 1024
+_artifact_errors: OrderedDict[tuple[str, bytes, str], tuple[ValidationError, ...]] = OrderedDict()
+_artifact_errors_lock = threading.Lock()
+
+
+def _validate_artifact_cached(artifact: GeneratedFile) -> tuple[ValidationError, ...]:
+    """
+    Memoized validate_artifact for the self-healing loop, where most files
+    come back unchanged between passes. Callers copy the returned errors.
+    """
+    content = artifact.get("content", "")
+    key = (
+        artifact.get("path", ""),
+        hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest(),
+        artifact.get("file_type", ""),
+    )
+    with _artifact_errors_lock:
+        errors = _artifact_errors.get(key)
+        if errors is not None:
+            _artifact_errors.move_to_end(key)
+            return errors
+
+    errors = tuple(validate_artifact(artifact))
+    with _artifact_errors_lock:
+        _artifact_errors[key] = errors
+        if len(_artifact_errors) > _ARTIFACT_ERRORS_MAX_ENTRIES:
+            _artifact_errors.popitem(last=False)
+    return errors
+
+
+def _rule_based_errors(artifacts: list[GeneratedFile]) -> list[ValidationError]:
+    """Rule-based validation errors for all artifacts."""
+    errors: list[ValidationError] = []
+    for artifact in artifacts:
+        try:
+            errors.extend(dict(e) for e in _validate_artifact_cached(artifact))
+        except Exception as e:
+            logger.warning(f"Validation error for {artifact.get('path')}: {e}")
+    return errors
+
+
 def _infer_agent(filepath: str) -> str:
     """Infer which agent is responsible for a file based on its path."""
     path_lower = filepath.lower()
@@ -440,11 +490,16 @@ async def validation_agent(state: BuilderState) -> BuilderState:
 
     log_progress(state, "Starting validation phase...")
 
-    # Collect all artifacts
-    all_artifacts = []
+    # Collect all artifacts, keyed by path so files re-emitted by retries or
+    # self-healing passes are validated once (latest version wins)
+    artifacts_by_path: dict[str, GeneratedFile] = {}
     for key in ["artifacts_db", "artifacts_srv", "artifacts_app", "artifacts_security",
                  "artifacts_ext", "artifacts_deploy", "artifacts_deployment", "artifacts_docs"]:
-        all_artifacts.extend(state.get(key, []))
+        for artifact in state.get(key, []):
+            artifacts_by_path[artifact.get("path", "")] = artifact
+    # This agent's own report changes every pass and is not under review
+    artifacts_by_path.pop(COMPLIANCE_REPORT_PATH, None)
+    all_artifacts = list(artifacts_by_path.values())
 
     if not all_artifacts:
         log_progress(state, "Warning: No artifacts found to validate.")
@@ -452,58 +507,78 @@ async def validation_agent(state: BuilderState) -> BuilderState:
     project_name = state.get("project_name", "App")
     namespace = state.get("project_namespace", "com.company.app")
 
+    # Fingerprint the artifact set so an unchanged self-healing pass neither
+    # pays for another LLM review nor loops again
+    digest = hashlib.blake2b(digest_size=16)
+    for path in sorted(artifacts_by_path):
+        digest.update(path.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(artifacts_by_path[path].get("content", "").encode("utf-8"))
+        digest.update(b"\0")
+    artifacts_digest = digest.hexdigest()
+    unchanged = artifacts_digest == state.get("validation_artifacts_digest")
+    state["validation_artifacts_digest"] = artifacts_digest
+
     # ==========================================================================
     # LLM-driven validation
     # ==========================================================================
     llm_success = False
-    try:
-        files_summary_parts = []
-        for artifact in all_artifacts:
-            path = artifact.get("path", "unknown")
-            content = artifact.get("content", "")
-            truncated = content[:3000] if len(content) > 3000 else content
-            files_summary_parts.append(f"### {path}\n```\n{truncated}\n```")
-
-        files_content = "\n\n".join(files_summary_parts)
-
-        prompt = VALIDATION_PROMPT.format(
-            project_name=project_name,
-            namespace=namespace,
-            files_content=files_content,
-        )
-
-        log_progress(state, f"Calling LLM to validate {len(all_artifacts)} artifacts...")
-
-        result = await generate_with_retry(
-            prompt=prompt,
-            system_prompt=VALIDATION_SYSTEM_PROMPT,
-            state=state,
-            required_keys=["validation_results"],
-            max_retries=2,
-            agent_name="validation",
-        )
-
-        if result and "validation_results" in result:
-            for r in result["validation_results"]:
-                all_errors.append({
-                    "agent": "validation",
-                    "code": r.get("code", "LLM_VALIDATION"),
-                    "message": r.get("message", ""),
-                    "field": r.get("file"),
-                    "severity": r.get("severity", "warning"),
-                    "responsible_agent": r.get("responsible_agent", _infer_agent(r.get("file", ""))),
-                    "fix_hint": r.get("fix_hint", ""),
-                })
-
-            score = result.get("overall_score", 0)
-            log_progress(state, f"LLM validation complete. Score: {score}/100.")
-            llm_success = True
-        else:
-            log_progress(state, "Could not parse LLM validation response. Using rules only.")
+    cached_llm_results = state.get("validation_llm_results") if unchanged else None
+    if cached_llm_results is not None:
+        log_progress(state, "Artifacts unchanged since last validation. Reusing LLM review.")
+        all_errors.extend(dict(e) for e in cached_llm_results)
+        llm_success = True
+    else:
+        state["validation_llm_results"] = None
+        try:
+            files_summary_parts = []
+            for artifact in all_artifacts:
+                path = artifact.get("path", "unknown")
+                content = artifact.get("content", "")
+                truncated = content[:3000] if len(content) > 3000 else content
+                files_summary_parts.append(f"### {path}\n```\n{truncated}\n```")
+
+            files_content = "\n\n".join(files_summary_parts)
+
+            prompt = VALIDATION_PROMPT.format(
+                project_name=project_name,
+                namespace=namespace,
+                files_content=files_content,
+            )
+
+            log_progress(state, f"Calling LLM to validate {len(all_artifacts)} artifacts...")
+
+            result = await generate_with_retry(
+                prompt=prompt,
+                system_prompt=VALIDATION_SYSTEM_PROMPT,
+                state=state,
+                required_keys=["validation_results"],
+                max_retries=2,
+                agent_name="validation",
+            )
+
+            if result and "validation_results" in result:
+                for r in result["validation_results"]:
+                    all_errors.append({
+                        "agent": "validation",
+                        "code": r.get("code", "LLM_VALIDATION"),
+                        "message": r.get("message", ""),
+                        "field": r.get("file"),
+                        "severity": r.get("severity", "warning"),
+                        "responsible_agent": r.get("responsible_agent", _infer_agent(r.get("file", ""))),
+                        "fix_hint": r.get("fix_hint", ""),
+                    })
+
+                state["validation_llm_results"] = [dict(e) for e in all_errors]
+                score = result.get("overall_score", 0)
+                log_progress(state, f"LLM validation complete. Score: {score}/100.")
+                llm_success = True
+            else:
+                log_progress(state, "Could not parse LLM validation response. Using rules only.")
 
-    except Exception as e:
-        logger.warning(f"LLM validation failed: {e}")
-        log_progress(state, f"LLM validation failed ({str(e)[:80]}). Using rules only.")
+        except Exception as e:
+            logger.warning(f"LLM validation failed: {e}")
+            log_progress(state, f"LLM validation failed ({str(e)[:80]}). Using rules only.")
 
     # ==========================================================================
     # Deterministic Rule Checklist (NEW - from RAG module)
@@ -534,12 +609,8 @@ async def validation_agent(state: BuilderState) -> BuilderState:
     # Rule-based validation (always runs)
     # ==========================================================================
     log_progress(state, "Running rule-based validation checks...")
-    for artifact in all_artifacts:
-        try:
-            rule_errors = validate_artifact(artifact)
-            all_errors.extend(rule_errors)
-        except Exception as e:
-            logger.warning(f"Validation error for {artifact.get('path')}: {e}")
+    # CPU-bound over every file; keep the event loop free for other sessions
+    all_errors.extend(await asyncio.to_thread(_rule_based_errors, all_artifacts))
 
     # ==========================================================================
     # Cross-file consistency check
@@ -558,7 +629,12 @@ async def validation_agent(state: BuilderState) -> BuilderState:
     retry_count = state.get("validation_retry_count", 0)
     max_retries = 5  # Maximum self-healing loops
 
-    if error_count > 0 and retry_count < max_retries:
+    if error_count > 0 and retry_count > 0 and unchanged:
+        # The last correction pass did not change any file; looping again
+        # would repeat the same review with the same outcome
+        state["needs_correction"] = False
+        log_progress(state, f"⚠️ Correction produced no changes. Stopping self-healing with {error_count} errors.")
+    elif error_count > 0 and retry_count < max_retries:
         corrections = _build_correction_context(state, all_errors)
         if corrections:
             # Find the first agent that needs correction
@@ -584,7 +660,7 @@ async def validation_agent(state: BuilderState) -> BuilderState:
     # ==========================================================================
     report = generate_compliance_report(state, all_errors)
     generated_files.append({
-        "path": "docs/COMPLIANCE_REPORT.md",
+        "path": COMPLIANCE_REPORT_PATH,
         "content": report,
         "file_type": "md",
     })
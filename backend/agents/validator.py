@@ -74,6 +74,12 @@ VALID_CDS_TYPES = {
     # Custom / imported types are also allowed if capitalized
 }
 
+# Patterns applied line by line, compiled once
+_FIELD_TYPE_RE = re.compile(r":\s*(\w+)(?:\(|\s*;|\s*$)")
+_HARDCODED_CREDENTIAL_RE = re.compile(
+    r"(password|secret|api[_-]?key)\s*[:=]\s*[\"'](?!.*\$\{)", re.IGNORECASE
+)
+
 
 # =============================================================================
 # CDS Validation
@@ -127,7 +133,7 @@ def validate_cds(content: str, path: str = "schema.cds") -> ValidationResult:
 
     # ── Check field types ──
     for line_num, line in enumerate(lines, 1):
-        type_match = re.search(r":\s*(\w+)(?:\(|\s*;|\s*$)", line.strip())
+        type_match = _FIELD_TYPE_RE.search(line.strip())
         if type_match and "key " not in line[:line.find(":") if ":" in line else 0]:
             cds_type = type_match.group(1)
             if cds_type not in VALID_CDS_TYPES and not cds_type[0].isupper():
@@ -347,7 +353,7 @@ def validate_best_practices(content: str, path: str, file_type: str) -> Validati
 
     for line_num, line in enumerate(lines, 1):
         # Hardcoded credentials
-        if re.search(r"(password|secret|api[_-]?key)\s*[:=]\s*[\"'](?!.*\$\{)", line, re.IGNORECASE):
+        if _HARDCODED_CREDENTIAL_RE.search(line):
             if not line.strip().startswith("//") and not line.strip().startswith("#"):
                 issues.append(ValidationIssue(
                     severity=ValidationSeverity.ERROR,
@@ -374,6 +380,17 @@ def validate_best_practices(content: str, path: str, file_type: str) -> Validati
 # Cross-File Consistency Checker
 # =============================================================================
 
+def _last_artifact_content(artifacts: list, suffix: str) -> str | None:
+    """
+    Content of the last artifact whose path ends with ``suffix``.
+    Scans from the end so the latest version wins without a full pass.
+    """
+    return next(
+        (art.get("content", "") for art in reversed(artifacts) if art.get("path", "").endswith(suffix)),
+        None,
+    )
+
+
 def validate_cross_file_consistency(state: dict) -> ValidationResult:
     """
     Check that entity names are consistent across all generated files:
@@ -388,17 +405,14 @@ def validate_cross_file_consistency(state: dict) -> ValidationResult:
         return ValidationResult(is_valid=True, issues=[], artifact_path="cross-file", validator_type="consistency")
 
     # Check schema.cds
-    schema_entities = set()
-    for art in state.get("artifacts_db", []):
-        if art.get("path", "").endswith("schema.cds"):
-            schema_entities = set(re.findall(r"entity\s+(\w+)", art.get("content", "")))
+    schema = _last_artifact_content(state.get("artifacts_db", []), "schema.cds")
+    schema_entities = set(re.findall(r"entity\s+(\w+)", schema)) if schema is not None else set()
 
     # Check service.cds
-    service_entities = set()
-    for art in state.get("artifacts_srv", []):
-        if art.get("path", "").endswith("service.cds"):
-            content = art.get("content", "")
-            service_entities = set(re.findall(r"entity\s+(\w+)\s+as\s+projection", content))
+    service = _last_artifact_content(state.get("artifacts_srv", []), "service.cds")
+    service_entities = (
+        set(re.findall(r"entity\s+(\w+)\s+as\s+projection", service)) if service is not None else set()
+    )
 
     # Check for missing projections
     for ename in entity_names:
@@ -478,11 +492,16 @@ def compute_quality_score(state: dict) -> dict:
             dm_score += 2  # Base score for having schema
     breakdown["data_model"] = min(dm_score * 5, 100)  # Scale to 100
 
-    # ── Service Layer (20 points max) ──
+    # ── Service Layer (20 points max) + Business Logic (20 points max) ──
+    # Both score artifacts_srv, so walk it once; handler details are kept
+    # separate to list them after the service ones
     sl_score = 0
+    bl_score = 0
+    bl_details: list[str] = []
     for art in state.get("artifacts_srv", []):
         content = art.get("content", "")
-        if "service.cds" in art.get("path", ""):
+        path = art.get("path", "")
+        if "service.cds" in path:
             sl_score += 3  # Has service file
             if "projection" in content:
                 sl_score += 3
@@ -490,7 +509,7 @@ def compute_quality_score(state: dict) -> dict:
                 sl_score += 3; details.append("✅ Draft enabled")
             if "action " in content or "function " in content:
                 sl_score += 2; details.append("✅ Custom actions/functions")
-        if "annotations" in art.get("path", ""):
+        if "annotations" in path:
             sl_score += 2
             if "UI.HeaderInfo" in content:
                 sl_score += 2; details.append("✅ Deep Fiori annotations")
@@ -500,30 +519,26 @@ def compute_quality_score(state: dict) -> dict:
                 sl_score += 2
             if "Common.ValueList" in content:
                 sl_score += 1
-    breakdown["service_layer"] = min(sl_score * 5, 100)
-
-    # ── Business Logic (20 points max) ──
-    bl_score = 0
-    for art in state.get("artifacts_srv", []):
-        content = art.get("content", "")
-        if art.get("path", "").endswith(".js"):
+        if path.endswith(".js"):
             bl_score += 3
             if "cds.log" in content:
-                bl_score += 3; details.append("✅ Structured logging")
+                bl_score += 3; bl_details.append("✅ Structured logging")
             if "req.error" in content:
-                bl_score += 2; details.append("✅ Input validation")
+                bl_score += 2; bl_details.append("✅ Input validation")
             if "before" in content and "after" in content:
-                bl_score += 2; details.append("✅ Before/after event handlers")
+                bl_score += 2; bl_details.append("✅ Before/after event handlers")
             if "this.on" in content:
-                bl_score += 2; details.append("✅ Custom action handlers")
+                bl_score += 2; bl_details.append("✅ Custom action handlers")
             if "try" in content and "catch" in content:
-                bl_score += 2; details.append("✅ Error handling")
+                bl_score += 2; bl_details.append("✅ Error handling")
             if "status" in content.lower() and "transition" in content.lower():
                 bl_score += 2
             if "SELECT" in content and "UPDATE" in content:
                 bl_score += 2
             bl_score += 2
+    breakdown["service_layer"] = min(sl_score * 5, 100)
     breakdown["business_logic"] = min(bl_score * 5, 100)
+    details.extend(bl_details)
 
     # ── Fiori UI (15 points max) ──
     fi_score = 0
@@ -16,7 +16,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.database import get_db
 from backend.models import Session
-from backend.agents.state import create_initial_state, BuilderState
+from backend.agents.state import create_initial_state, BuilderState, GenerationStatus as WorkflowStatus
 from backend.agents.graph import run_generation_workflow
 from backend.agents.human_gate import get_active_gate, set_gate_decision, get_gate_event
 
@@ -155,60 +155,65 @@ async def start_generation(
     session.status = "in_progress"
     await db.commit()
     
-    try:
-        # Run the workflow
-        final_state = await run_generation_workflow(initial_state)
-        
-        # Update session with results
-        session.status = final_state.get("generation_status", "completed")
-        session.configuration = {
-            **config,
-            "entities": final_state.get("entities", []),
-            "relationships": final_state.get("relationships", []),
-            "business_rules": final_state.get("business_rules", []),
-            "artifacts_db": final_state.get("artifacts_db", []),
-            "artifacts_srv": final_state.get("artifacts_srv", []),
-            "artifacts_app": final_state.get("artifacts_app", []),
-            "artifacts_deployment": final_state.get("artifacts_deployment", []),
-            "artifacts_docs": final_state.get("artifacts_docs", []),
-            "agent_history": final_state.get("agent_history", []),
-            "validation_errors": final_state.get("validation_errors", []),
-            "enterprise_blueprint": final_state.get("enterprise_blueprint", {}),
-            "service_modules": final_state.get("service_modules", []),
-            "ui_apps": final_state.get("ui_apps", []),
-            "quality_gates": final_state.get("quality_gates", []),
-            "generated_workspace_path": final_state.get("generated_workspace_path"),
-            "generated_manifest": final_state.get("generated_manifest"),
-            "verification_checks": final_state.get("verification_checks", []),
-            "verification_summary": final_state.get("verification_summary"),
-        }
-        session.completed_at = datetime.utcnow()
-        await db.commit()
-        
-        logger.info(f"Generation completed for session {session_id}")
-        
-        return GenerationStatus(
-            session_id=session_id,
-            status=final_state.get("generation_status", "completed"),
-            current_agent=final_state.get("current_agent"),
-            agent_history=final_state.get("agent_history", []),
-            validation_errors=final_state.get("validation_errors", []),
-            started_at=final_state.get("generation_started_at"),
-            completed_at=final_state.get("generation_completed_at"),
-            workspace_path=final_state.get("generated_workspace_path"),
-            verification_summary=final_state.get("verification_summary"),
-        )
-        
-    except Exception as e:
-        logger.error(f"Generation failed for session {session_id}: {e}")
+    # Run the workflow; a crash comes back as a FAILED state with a
+    # WORKFLOW_ERROR entry rather than raising
+    final_state = await run_generation_workflow(initial_state)
+
+    workflow_error = next(
+        (e for e in final_state.get("validation_errors", []) if e.get("code") == "WORKFLOW_ERROR"),
+        None,
+    )
+    if final_state.get("generation_status") == WorkflowStatus.FAILED.value and workflow_error:
+        logger.error(f"Generation failed for session {session_id}: {workflow_error['message']}")
+        # Keep the previous configuration so earlier artifacts stay available
         session.status = "failed"
         await db.commit()
-        
+
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Generation failed: {str(e)}",
+            detail=f"Generation failed: {workflow_error['message']}",
         )
 
+    # Update session with results
+    session.status = final_state.get("generation_status", "completed")
+    session.configuration = {
+        **config,
+        "entities": final_state.get("entities", []),
+        "relationships": final_state.get("relationships", []),
+        "business_rules": final_state.get("business_rules", []),
+        "artifacts_db": final_state.get("artifacts_db", []),
+        "artifacts_srv": final_state.get("artifacts_srv", []),
+        "artifacts_app": final_state.get("artifacts_app", []),
+        "artifacts_deployment": final_state.get("artifacts_deployment", []),
+        "artifacts_docs": final_state.get("artifacts_docs", []),
+        "agent_history": final_state.get("agent_history", []),
+        "validation_errors": final_state.get("validation_errors", []),
+        "enterprise_blueprint": final_state.get("enterprise_blueprint", {}),
+        "service_modules": final_state.get("service_modules", []),
+        "ui_apps": final_state.get("ui_apps", []),
+        "quality_gates": final_state.get("quality_gates", []),
+        "generated_workspace_path": final_state.get("generated_workspace_path"),
+        "generated_manifest": final_state.get("generated_manifest"),
+        "verification_checks": final_state.get("verification_checks", []),
+        "verification_summary": final_state.get("verification_summary"),
+    }
+    session.completed_at = datetime.utcnow()
+    await db.commit()
+    
+    logger.info(f"Generation finished for session {session_id} with status {session.status}")
+    
+    return GenerationStatus(
+        session_id=session_id,
+        status=final_state.get("generation_status", "completed"),
+        current_agent=final_state.get("current_agent"),
+        agent_history=final_state.get("agent_history", []),
+        validation_errors=final_state.get("validation_errors", []),
+        started_at=final_state.get("generation_started_at"),
+        completed_at=final_state.get("generation_completed_at"),
+        workspace_path=final_state.get("generated_workspace_path"),
+        verification_summary=final_state.get("verification_summary"),
+    )
+
 
 @router.get("/{session_id}/generate/stream")
 async def stream_generation(
@@ -264,6 +269,9 @@ async def stream_generation(
                     # Note: We might need a separate db session for the generator if it lasts long
                     pass 
                 
+                # The full state is saved below rather than streamed; clients
+                # fetch the artifacts once the workflow completes
+                final_state = event.pop("final_state", None) or {}
                 yield f"data: {json.dumps(event)}\n\n"
                 
                 if event["type"] == "workflow_complete":
@@ -271,7 +279,6 @@ async def stream_generation(
                     res = await db.execute(select(Session).where(Session.id == session_id))
                     s = res.scalar_one()
                     
-                    final_state = event.get("final_state", {})
                     config = s.configuration or {}
                     
                     # Merge logic: prioritize final_state but keep existing configuration keys if needed
@@ -259,8 +259,9 @@ async def regenerate_app(
             yield f"data: {json_module.dumps({'type': 'connected', 'session_id': session_id, 'regeneration': True})}\n\n"
             
             async for event in run_generation_workflow_streaming(initial_state):
+                # The full state is saved here rather than streamed
+                final_state = event.pop("final_state", None) or {}
                 if event.get("type") == "workflow_complete":
-                    final_state = event.get("final_state", {})
                     session_refresh = await db.get(Session, session_id)
                     if session_refresh:
                         session_refresh.status = final_state.get("generation_status", "completed")
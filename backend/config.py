@@ -112,6 +112,9 @@ class Settings(BaseSettings):
     # ==========================================================================
     artifacts_path: str = "./artifacts"
     templates_path: str = "./backend/templates"
+    # Directory for compiled Jinja2 templates, reused across restarts
+    # (empty = compile in memory on each start)
+    template_bytecode_cache_path: str = ""
 
     # ==========================================================================
     # Production Settings
@@ -126,6 +129,20 @@ class Settings(BaseSettings):
     # Redis for caching/rate limiting (optional)
     redis_url: str | None = None
 
+    # Local cache of parsed LLM responses for repeated generations (opt-in)
+    llm_cache_enabled: bool = False
+    llm_cache_path: str = "./llm_cache.db"
+    llm_cache_ttl_seconds: int = 86400
+    llm_cache_max_entries: int = 500
+
+    # Maximum LLM requests in flight at once (agents can run concurrently)
+    llm_max_concurrency: int = 4
+
+    # Use the deployment template instead of the LLM for projects with at
+    # most this many entities on the standard setup (SQLite/HANA, mock/XSUAA
+    # auth, local or CF target); 0 = always call the LLM
+    deployment_template_max_entities: int = 0
+
     # Logging
     log_format: Literal["text", "json"] = "text"
     log_level: str = "INFO"
@@ -8,12 +8,29 @@ from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import (
+    BytecodeCache,
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    select_autoescape,
+)
+
+from backend.config import get_settings
 
 # Template directory
 TEMPLATES_DIR = Path(__file__).parent / "jinja_templates"
 
 
+def _bytecode_cache() -> BytecodeCache | None:
+    """On-disk cache of compiled templates, if configured."""
+    cache_dir = get_settings().template_bytecode_cache_path
+    if not cache_dir:
+        return None
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    return FileSystemBytecodeCache(cache_dir)
+
+
 @lru_cache()
 def get_template_engine() -> Environment:
     """Get or create the Jinja2 template environment."""
@@ -23,6 +40,7 @@ def get_template_engine() -> Environment:
         trim_blocks=True,
         lstrip_blocks=True,
         keep_trailing_newline=True,
+        bytecode_cache=_bytecode_cache(),
     )
 
 
@@ -84,6 +102,7 @@ def render_manifest_json(
     service_path: str,
     main_entity: str,
     theme: str = "sap_horizon",
+    list_template: str = "sap.fe.templates.ListReport",
 ) -> str:
     """Render Fiori manifest.json template."""
     return render_template(
@@ -94,6 +113,28 @@ def render_manifest_json(
             "service_path": service_path,
             "main_entity": main_entity,
             "theme": theme,
+            "list_template": list_template,
+        },
+    )
+
+
+def render_component_js(app_id: str) -> str:
+    """Render Fiori Elements Component.js template."""
+    return render_template("fiori/Component.js.j2", {"app_id": app_id})
+
+
+def render_i18n_properties(
+    app_title: str,
+    app_description: str,
+    labels: list[tuple[str, str]] | None = None,
+) -> str:
+    """Render Fiori i18n.properties template."""
+    return render_template(
+        "fiori/i18n.properties.j2",
+        {
+            "app_title": app_title,
+            "app_description": app_description,
+            "labels": labels or [],
         },
     )
 
@@ -3,9 +3,16 @@ Pytest Configuration and Fixtures
 """
 
 import asyncio
+import os
+import tempfile
 import pytest
 from typing import AsyncGenerator, Generator
 
+# Keep tests off the application database in the working tree; this must be
+# set before backend.database creates its engine
+_TEST_DB_DIR = tempfile.mkdtemp(prefix="sap_builder_tests_")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_TEST_DB_DIR}/sap_builder.db"
+
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from fastapi.testclient import TestClient
 from httpx import AsyncClient
@@ -16,7 +23,7 @@ from backend.config import get_settings
 
 
 # Test database URL
-TEST_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
+TEST_DATABASE_URL = f"sqlite+aiosqlite:///{_TEST_DB_DIR}/test.db"
 
 
 @pytest.fixture(scope="session")
@@ -3,14 +3,21 @@ Unit Tests for Builder Agents
 """
 
 import asyncio
+import json
+import threading
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from backend.agents.enterprise_architecture import enterprise_architecture_agent
 from backend.agents.project_assembly import project_assembly_agent
 from backend.agents.project_verification import project_verification_agent
 from backend.agents.requirements import requirements_agent
 from backend.agents.data_modeling import data_modeling_agent
+from backend.agents.deployment import DEPLOYMENT_FILE_MAP, deployment_agent
+from backend.agents.extension import extension_agent
+from backend.agents.llm_cache import LLMResponseCache
+from backend.agents.fiori_ui import fiori_ui_agent
+from backend.agents.validation import validation_agent
 from backend.agents.state import BuilderState, create_initial_state
 
 
@@ -61,6 +68,205 @@ class TestDataModelingAgent:
         assert "managed" in schema["content"]
 
 
+class TestDeploymentAgent:
+    """Tests for Deployment Agent."""
+
+    def test_deployment_falls_back_to_minimal_config(self, sample_builder_state):
+        state = BuilderState(sample_builder_state)
+
+        with patch("backend.agents.deployment.generate_with_retry", return_value=None):
+            result = _run(deployment_agent(state))
+
+        paths = {artifact["path"] for artifact in result["artifacts_deployment"]}
+        assert {"package.json", ".gitignore"} <= paths
+        assert result["validation_errors"][-1]["code"] == "LLM_FAILED"
+        assert result["agent_history"][-1]["duration_ms"] is not None
+
+    def test_interrupted_llm_call_cancels_fallback(self, sample_builder_state):
+        state = BuilderState(sample_builder_state)
+
+        async def _interrupted():
+            try:
+                await deployment_agent(state)
+            except RuntimeError:
+                pass
+            await asyncio.sleep(0)
+            # Checked before asyncio.run cancels leftover tasks on shutdown
+            return [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+        release = threading.Event()
+
+        def _slow_fallback(*args):
+            release.wait(5)
+            return []
+
+        with patch("backend.agents.deployment._minimal_deployment", side_effect=_slow_fallback), \
+                patch("backend.agents.deployment.generate_with_retry", side_effect=RuntimeError("interrupted")):
+            try:
+                pending = _run(_interrupted())
+            finally:
+                release.set()
+
+        assert pending == []
+
+    def test_template_renders_complete_descriptor_set(self, sample_builder_state):
+        state = BuilderState(sample_builder_state)
+        settings = MagicMock(deployment_template_max_entities=5)
+
+        with patch("backend.agents.deployment.get_settings", return_value=settings), \
+                patch("backend.agents.deployment.generate_with_retry") as generate:
+            result = _run(deployment_agent(state))
+
+        generate.assert_not_called()
+        files = {artifact["path"]: artifact["content"] for artifact in result["artifacts_deployment"]}
+        assert {spec.path for spec in DEPLOYMENT_FILE_MAP.values()} <= set(files)
+        assert "service: hana" in files["mta.yaml"] and "service: xsuaa" in files["mta.yaml"]
+        assert json.loads(files["package.json"])["cds"]["requires"]["auth"]["[production]"]["kind"] == "xsuaa"
+
+    def test_template_is_skipped_for_kyma(self, sample_builder_state):
+        state = BuilderState(sample_builder_state)
+        state["deployment_target"] = "kyma"
+        settings = MagicMock(deployment_template_max_entities=5)
+
+        with patch("backend.agents.deployment.get_settings", return_value=settings), \
+                patch("backend.agents.deployment.generate_with_retry", return_value=None) as generate:
+            _run(deployment_agent(state))
+
+        generate.assert_called_once()
+
+    def test_structural_cache_skips_ambiguous_project_values(self, sample_builder_state, tmp_path):
+        state = BuilderState(sample_builder_state)
+        state["project_name"] = "Test"
+        state["project_namespace"] = "com.acme.test"
+        cache = LLMResponseCache(str(tmp_path / "cache.db"))
+        # The MTA id "test" is also the npm test script
+        response = {"package_json": '{"name": "test", "scripts": {"test": "jest"}}'}
+
+        with patch("backend.agents.deployment.get_llm_cache", return_value=cache), \
+                patch("backend.agents.deployment.generate_with_retry", return_value=response):
+            _run(deployment_agent(state))
+
+        count = cache._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        assert count == 1
+
+
+class TestFioriUIAgent:
+    """Tests for Fiori UI Agent."""
+
+    def test_fallback_includes_i18n_labels(self, sample_builder_state):
+        state = BuilderState(sample_builder_state)
+
+        with patch("backend.agents.fiori_ui.generate_with_retry", return_value=None):
+            result = _run(fiori_ui_agent(state))
+
+        files = {a["path"]: a["content"] for a in result["artifacts_app"]}
+        i18n = files["app/customer/webapp/i18n/i18n.properties"]
+        assert "appTitle=TestApp" in i18n
+        assert "Order_orderNumber=Order Number" in i18n
+        assert "app/customer/xs-app.json" in files
+        assert result["validation_errors"][-1]["code"] == "LLM_FAILED"
+
+
+    def test_object_manifest_is_serialized(self, sample_builder_state):
+        state = BuilderState(sample_builder_state)
+        manifest = {"sap.app": {"id": "testapp"}}
+
+        with patch("backend.agents.fiori_ui.generate_with_retry", return_value={
+            "apps": [{"entity": "Customer", "manifest_json": manifest, "component_js": "// c"}],
+        }):
+            result = _run(fiori_ui_agent(state))
+
+        files = {a["path"]: a["content"] for a in result["artifacts_app"]}
+        assert json.loads(files["app/customer/webapp/manifest.json"]) == manifest
+
+    def test_prompt_entities_keep_only_ui_fields(self):
+        from backend.agents.fiori_ui import _prompt_entities
+
+        entities = [{
+            "name": "Order",
+            "aspects": ["cuid"],
+            "fields": [
+                {"name": "ID", "type": "UUID", "key": True, "nullable": False},
+                {"name": "total", "type": "Decimal", "precision": 15, "annotations": {"title": "Total"}},
+            ],
+        }]
+
+        assert _prompt_entities(entities) == [{
+            "name": "Order",
+            "description": "",
+            "fields": [
+                {"name": "ID", "type": "UUID", "key": True},
+                {"name": "total", "type": "Decimal", "title": "Total"},
+            ],
+        }]
+
+
+class TestExtensionAgent:
+    """Tests for Extension Agent."""
+
+    def test_no_entities_skips_llm(self, sample_builder_state):
+        state = BuilderState(sample_builder_state)
+        state["entities"] = []
+
+        with patch("backend.agents.extension.generate_with_retry") as generate:
+            result = _run(extension_agent(state))
+
+        generate.assert_not_called()
+        assert result["artifacts_srv"][-1]["path"] == "srv/lib/hooks.js"
+        assert not any(e["code"] == "LLM_FAILED" for e in result["validation_errors"])
+
+    def test_cds_outline_folds_entity_bodies(self):
+        from backend.agents.extension import _summarize_cds
+
+        schema = (
+            "namespace com.acme;\n"
+            "entity Orders : cuid {\n  title : String;\n  status : String enum { open; closed; };\n}\n"
+            "service CatalogService {\n  entity Orders as projection on db.Orders;\n}\n"
+        )
+
+        assert _summarize_cds(schema) == (
+            "namespace com.acme;\n"
+            "entity Orders : cuid { ... }\n"
+            "service CatalogService {\n  entity Orders as projection on db.Orders;\n}"
+        )
+
+
+class TestValidationAgent:
+    """Tests for Validation Agent."""
+
+    def test_rule_errors_are_cached_by_content_digest(self):
+        from backend.agents import validation
+
+        content = "entity Customer {" + " " * 10000
+        artifact = {"path": "db/schema.cds", "content": content, "file_type": "cds"}
+
+        with patch.object(validation, "validate_artifact", wraps=validation.validate_artifact) as check:
+            first = validation._validate_artifact_cached(artifact)
+            second = validation._validate_artifact_cached(dict(artifact))
+
+        assert first == second
+        assert check.call_count == 1
+        assert all(content not in key for key in validation._artifact_errors)
+
+    def test_unchanged_artifacts_stop_self_healing(self, sample_builder_state):
+        state = BuilderState(sample_builder_state)
+        state["artifacts_db"] = [{"path": "db/schema.cds", "content": "entity Customer {", "file_type": "cds"}]
+        review = {"validation_results": [{
+            "file": "db/schema.cds", "severity": "error", "code": "CDS_SYNTAX",
+            "message": "Unclosed entity", "responsible_agent": "data_modeling",
+        }]}
+
+        with patch("backend.agents.validation.generate_with_retry", return_value=review) as mock_llm:
+            first = _run(validation_agent(state))
+            assert first["needs_correction"] is True
+
+            # The correction pass returned the same files
+            second = _run(validation_agent(first))
+
+        assert mock_llm.call_count == 1
+        assert second["needs_correction"] is False
+
+
 class TestEnterpriseAgents:
     """Tests for the enterprise-oriented deterministic agents."""
 
@@ -148,3 +354,131 @@ class TestEnterpriseAgents:
 
         assert result["verification_summary"]["failed"] == 0
         assert any(artifact["path"] == "docs/VERIFICATION_REPORT.md" for artifact in result["artifacts_docs"])
+
+
+class TestKnowledgeLoader:
+    """Tests for the RAG knowledge getters."""
+
+    def test_empty_retrieval_is_not_cached(self):
+        from backend.agents import knowledge_loader
+
+        knowledge_loader._rag_cache.clear()
+        with patch.object(knowledge_loader, "query_sap_knowledge", side_effect=["", "CDS docs", "other"]) as query:
+            assert "CDS docs" not in knowledge_loader.get_data_modeling_knowledge()
+            assert "CDS docs" in knowledge_loader.get_data_modeling_knowledge()
+            assert "CDS docs" in knowledge_loader.get_data_modeling_knowledge()
+
+        assert query.call_count == 2
+        knowledge_loader._rag_cache.clear()
+
+
+class TestConcurrentPhases:
+    """Tests for running independent agents concurrently."""
+
+    def test_branch_updates_are_merged(self):
+        from backend.agents.graph import run_agents_concurrently
+
+        async def first(state):
+            state["artifacts_srv"] = state["artifacts_srv"] + [{"path": "a", "content": "", "file_type": "js"}]
+            state["agent_history"] = state["agent_history"] + [{"agent_name": "first", "status": "completed"}]
+            return state
+
+        async def second(state):
+            state["artifacts_docs"] = [{"path": "b", "content": "", "file_type": "markdown"}]
+            state["agent_history"] = state["agent_history"] + [{"agent_name": "second", "status": "completed"}]
+            return state
+
+        state = {"artifacts_srv": [], "artifacts_docs": [], "agent_history": [{"agent_name": "deployment"}]}
+        result = _run(run_agents_concurrently(state, {"first": first, "second": second}, "phase"))
+
+        assert [a["path"] for a in result["artifacts_srv"]] == ["a"]
+        assert [a["path"] for a in result["artifacts_docs"]] == ["b"]
+        assert [h["agent_name"] for h in result["agent_history"]] == ["deployment", "first", "second"]
+        assert state["agent_history"] == [{"agent_name": "deployment"}]
+
+    def test_branch_logs_are_concatenated(self):
+        from backend.agents.graph import run_agents_concurrently
+
+        def _agent(name):
+            async def agent(state):
+                state["current_logs"] = [f"{name} log"]
+                state["current_agent"] = name
+                return state
+            return agent
+
+        state = {"current_logs": ["previous log"], "current_agent": "ux_design"}
+        result = _run(run_agents_concurrently(state, {"a": _agent("a"), "b": _agent("b")}, "phase"))
+
+        assert result["current_logs"] == ["a log", "b log"]
+        assert result["current_agent"] == "phase"
+
+    def test_correction_runs_only_target_agent(self):
+        from backend.agents.graph import run_agents_concurrently
+
+        calls = []
+
+        def _agent(name):
+            async def agent(state):
+                calls.append(name)
+                state["needs_correction"] = False
+                return state
+            return agent
+
+        state = {"needs_correction": True, "correction_agent": "security"}
+        _run(run_agents_concurrently(state, {"fiori_ui": _agent("fiori_ui"), "security": _agent("security")}, "phase"))
+
+        assert calls == ["security"]
+
+    def test_branch_needing_correction_is_retried(self):
+        from backend.agents.graph import run_agents_concurrently
+
+        async def flaky(state):
+            state["attempts"] = state.get("attempts", 0) + 1
+            state["needs_correction"] = state["attempts"] < 3
+            return state
+
+        result = _run(run_agents_concurrently({"needs_correction": False}, {"flaky": flaky}, "phase"))
+
+        assert result["attempts"] == 3
+        assert result["needs_correction"] is False
+
+    def test_completion_events_carry_accumulated_history(self):
+        from backend.agents.graph import run_agents_concurrently
+
+        def _agent(name):
+            async def agent(state):
+                state["agent_history"] = state["agent_history"] + [{"agent_name": name, "status": "completed"}]
+                return state
+            return agent
+
+        events = []
+
+        async def _capture(session_id, event):
+            events.append(event)
+
+        state = {"session_id": "s", "agent_history": [{"agent_name": "ux_design"}]}
+        with patch("backend.agents.progress.push_event", side_effect=_capture):
+            _run(run_agents_concurrently(state, {"a": _agent("a"), "b": _agent("b")}, "phase"))
+
+        assert [[h["agent_name"] for h in e["agent_history"]] for e in events] == [
+            ["ux_design", "a"],
+            ["ux_design", "a", "b"],
+        ]
+
+
+class TestWorkflow:
+    """Tests for the workflow entry points."""
+
+    def test_graph_error_returns_failed_state(self):
+        from backend.agents.graph import run_generation_workflow
+
+        class BrokenGraph:
+            async def ainvoke(self, state):
+                raise RuntimeError("boom")
+
+        state = create_initial_state(session_id="workflow-test", project_name="Broken App")
+        with patch("backend.agents.graph.get_builder_graph", return_value=BrokenGraph()):
+            result = _run(run_generation_workflow(state))
+
+        assert result["generation_status"] == "failed"
+        assert result["validation_errors"][-1]["code"] == "WORKFLOW_ERROR"
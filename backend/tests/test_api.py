@@ -2,6 +2,8 @@
 Integration Tests for FastAPI API Endpoints
 """
 
+from unittest.mock import patch
+
 import pytest
 from fastapi import status
 
@@ -115,6 +117,45 @@ class TestBuilderAPI:
         
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
+    def test_generate_failure_keeps_configuration(self, client, sample_session_data):
+        """Test that a failed workflow marks the session failed without wiping it."""
+        create_response = client.post("/api/sessions", json=sample_session_data)
+        session_id = create_response.json()["id"]
+
+        async def failed_workflow(state):
+            state["generation_status"] = "failed"
+            state["validation_errors"] = [{"code": "WORKFLOW_ERROR", "message": "boom"}]
+            return state
+
+        with patch("backend.api.builder.run_generation_workflow", side_effect=failed_workflow):
+            response = client.post(f"/api/builder/{session_id}/generate", json={})
+
+        assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+        assert "boom" in response.json()["detail"]
+        session = client.get(f"/api/sessions/{session_id}").json()
+        assert session["status"] == "failed"
+        assert "artifacts_db" not in (session.get("configuration") or {})
+
+    def test_generate_saves_graph_failure(self, client, sample_session_data):
+        """Test that a run ending in the FAILED terminal keeps its results."""
+        create_response = client.post("/api/sessions", json=sample_session_data)
+        session_id = create_response.json()["id"]
+
+        async def failed_run(state):
+            state["generation_status"] = "failed"
+            state["agent_history"] = [{"agent_name": "requirements", "status": "completed"}]
+            state["validation_errors"] = [{"code": "NO_ENTITIES", "message": "No entities", "severity": "error"}]
+            return state
+
+        with patch("backend.api.builder.run_generation_workflow", side_effect=failed_run):
+            response = client.post(f"/api/builder/{session_id}/generate", json={})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["status"] == "failed"
+        session = client.get(f"/api/sessions/{session_id}").json()
+        assert session["status"] == "failed"
+        assert session["configuration"]["validation_errors"][0]["code"] == "NO_ENTITIES"
+
     def test_get_status_requires_session(self, client):
         """Test that status check requires valid session."""
         response = client.get("/api/builder/invalid-session/status")
@@ -0,0 +1,105 @@
+"""
+Unit Tests for the Local LLM Response Cache
+"""
+
+import asyncio
+from unittest.mock import patch
+
+from backend.agents.llm_cache import (
+    LLMResponseCache,
+    normalize_placeholders,
+    restore_placeholders,
+    structural_entry,
+)
+
+
+class TestLLMResponseCache:
+    """Tests for LLMResponseCache."""
+
+    def test_round_trip(self, tmp_path):
+        cache = LLMResponseCache(str(tmp_path / "cache.db"))
+        key = cache.make_key("deployment", {"prompt": "p"})
+
+        assert cache.get(key) is None
+        cache.set(key, {"package_json": "{}"})
+        assert cache.get(key) == {"package_json": "{}"}
+
+    def test_async_round_trip(self, tmp_path):
+        cache = LLMResponseCache(str(tmp_path / "cache.db"))
+
+        async def _round_trip():
+            await cache.aset("key", {"package_json": "{}"})
+            return await cache.aget("key")
+
+        assert asyncio.run(_round_trip()) == {"package_json": "{}"}
+
+    def test_key_depends_on_inputs(self):
+        base = LLMResponseCache.make_key("deployment", {"prompt": "p", "model": "a"})
+
+        assert base == LLMResponseCache.make_key("deployment", {"model": "a", "prompt": "p"})
+        assert base != LLMResponseCache.make_key("deployment", {"prompt": "p", "model": "b"})
+        assert base != LLMResponseCache.make_key("extension", {"prompt": "p", "model": "a"})
+
+    def test_expired_entries_are_dropped(self, tmp_path):
+        cache = LLMResponseCache(str(tmp_path / "cache.db"), ttl_seconds=10)
+        cache.set("k", {"v": 1})
+
+        with patch("backend.agents.llm_cache.time.time", return_value=10**12):
+            assert cache.get("k") is None
+
+    def test_least_recently_used_entries_are_evicted(self, tmp_path):
+        cache = LLMResponseCache(str(tmp_path / "cache.db"), ttl_seconds=10**10, max_entries=2)
+
+        with patch("backend.agents.llm_cache.time.time", side_effect=[1.0, 2.0, 3.0, 4.0]):
+            cache.set("a", {"v": "a"})
+            cache.set("b", {"v": "b"})
+            cache.get("a")
+            cache.set("c", {"v": "c"})
+
+        assert cache.get("b") is None
+        assert cache.get("a") == {"v": "a"}
+        assert cache.get("c") == {"v": "c"}
+
+
+class TestPlaceholders:
+    """Tests for structural normalization of cached responses."""
+
+    def test_restore_substitutes_other_project(self):
+        cached = normalize_placeholders(
+            {"mta_yaml": "ID: sales-app\n# Sales App (com.acme.sales)", "files": ["com.acme.sales"]},
+            {"__NAME__": "Sales App", "__MTAID__": "sales-app", "__NS__": "com.acme.sales"},
+        )
+
+        assert cached == {"mta_yaml": "ID: __MTAID__\n# __NAME__ (__NS__)", "files": ["__NS__"]}
+        restored = restore_placeholders(
+            cached,
+            {"__NAME__": "Order Hub", "__MTAID__": "order-hub", "__NS__": "com.acme.orders"},
+        )
+        assert restored == {"mta_yaml": "ID: order-hub\n# Order Hub (com.acme.orders)", "files": ["com.acme.orders"]}
+
+    def test_structural_entry_round_trips_distinct_values(self):
+        placeholders = {"__NAME__": "Sales App", "__MTAID__": "sales-app", "__NS__": "com.acme.sales"}
+        response = {"mta_yaml": "ID: sales-app\nmodules:\n  - name: sales-app-srv", "package_json": '{"name": "sales-app"}'}
+
+        assert structural_entry(response, placeholders) == {
+            "mta_yaml": "ID: __MTAID__\nmodules:\n  - name: __MTAID__-srv",
+            "package_json": '{"name": "__MTAID__"}',
+        }
+
+    def test_structural_entry_skips_values_used_as_ordinary_words(self):
+        placeholders = {"__NAME__": "Test", "__MTAID__": "test", "__NS__": "com.acme.test"}
+
+        # "test" is also an npm script name and command argument here
+        response = {
+            "mta_yaml": "ID: test",
+            "package_json": '{"name": "test", "scripts": {"test": "jest"}}',
+            "readme": "Run npm test before deploying.",
+        }
+        assert structural_entry(response, placeholders) is None
+        assert structural_entry({"readme": "Run the tests for test."}, placeholders) is None
+
+    def test_structural_entry_requires_round_trip(self):
+        placeholders = {"__NAME__": "Orders", "__MTAID__": "orders-app", "__NS__": "com.acme.orders"}
+
+        # A literal placeholder in the response would be restored too
+        assert structural_entry({"readme": "orders-app uses __NAME__"}, placeholders) is None
@@ -0,0 +1,131 @@
+"""
+Unit Tests for Shared LLM Utilities
+"""
+
+import asyncio
+import json
+from contextlib import aclosing
+
+from backend.agents.llm_providers import LLMManager
+from backend.agents.llm_utils import IncrementalJSONObject, merge_artifacts, parse_llm_json
+
+
+def _feed_all(text: str, size: int) -> tuple[list, IncrementalJSONObject]:
+    decoder = IncrementalJSONObject()
+    items = []
+    for i in range(0, len(text), size):
+        items.extend(decoder.feed(text[i:i + size]))
+    return items, decoder
+
+
+class TestParseLLMJSON:
+    """Tests for robust JSON extraction from LLM responses."""
+
+    def test_ignores_braces_after_the_object(self):
+        text = 'Here you go:\n{"hooks_js": "module.exports = {};"}\nUse it as {hooks}.'
+
+        assert parse_llm_json(text) == {"hooks_js": "module.exports = {};"}
+
+
+class TestIncrementalJSONObject:
+    """Tests for streamed top-level JSON member decoding."""
+
+    def test_members_match_full_parse(self):
+        text = '```json\n{"mta_yaml": "ID: app, \\"x\\" }", "count": 12, "files": [{"a": 1}], "ok": true}\n```'
+
+        for size in (1, 5, len(text)):
+            items, decoder = _feed_all(text, size)
+            assert dict(items) == parse_llm_json(text)
+            assert decoder.done
+
+    def test_member_is_emitted_before_object_closes(self):
+        decoder = IncrementalJSONObject()
+
+        assert decoder.feed('{"package_json": "{}", "readme') == [("package_json", "{}")]
+        assert decoder.feed('_md": "# App"') == []
+        assert decoder.feed("}") == [("readme_md", "# App")]
+
+    def test_large_value_fed_one_character_at_a_time(self):
+        content = 'line with "quotes", {braces} and [brackets]\n' * 4000
+        text = json.dumps({"readme_md": content, "size": 1})
+
+        decoder = IncrementalJSONObject()
+        decoded_chars = 0
+        raw_decode = decoder._decoder.raw_decode
+
+        def _counting_raw_decode(s, idx=0):
+            nonlocal decoded_chars
+            decoded_chars += len(s) - idx
+            return raw_decode(s, idx)
+
+        decoder._decoder.raw_decode = _counting_raw_decode
+        items = []
+        for char in text:
+            items.extend(decoder.feed(char))
+
+        assert dict(items) == {"readme_md": content, "size": 1}
+        assert decoder.done
+        # Each member is decoded once (key, then value), not once per chunk
+        assert decoded_chars <= 2 * len(text)
+
+    def test_skips_reasoning_block(self):
+        items, _ = _feed_all('<think>draft {"a": 0}</think>{"a": 1}', 4)
+
+        assert items == [("a", 1)]
+
+
+class _FakeProvider:
+    name = "fake"
+    supports_cache_control = False
+    supports_json_mode = False
+
+    async def stream(self, messages, **kwargs):
+        for chunk in ("{", '"a": 1', "}"):
+            yield chunk
+
+
+class TestLLMManagerConcurrency:
+    """Tests for the per-loop LLM concurrency limit."""
+
+    def _manager(self):
+        manager = LLMManager()
+        manager._providers = {"fake": _FakeProvider()}
+        return manager
+
+    def test_abandoned_stream_releases_its_slot(self):
+        manager = self._manager()
+
+        async def _stop_early():
+            async with aclosing(manager.stream("prompt", provider="fake")) as stream:
+                async for _ in stream:
+                    break
+            return manager._get_semaphore()
+
+        semaphore = asyncio.run(_stop_early())
+        assert not semaphore.locked()
+        assert semaphore._value == max(1, manager.settings.llm_max_concurrency)
+
+    def test_each_event_loop_gets_its_own_semaphore(self):
+        manager = self._manager()
+
+        async def _semaphore():
+            return manager._get_semaphore()
+
+        assert asyncio.run(_semaphore()) is not asyncio.run(_semaphore())
+
+
+class TestMergeArtifacts:
+    """Tests for path-keyed artifact merging."""
+
+    def test_regenerated_file_replaces_previous_version(self):
+        existing = [
+            {"path": "mta.yaml", "content": "old", "file_type": "yaml"},
+            {"path": ".github/workflows/ci.yml", "content": "ci", "file_type": "yml"},
+        ]
+        merged = merge_artifacts(existing, [
+            {"path": "mta.yaml", "content": "new", "file_type": "yaml"},
+            {"path": "package.json", "content": "{}", "file_type": "json"},
+        ])
+
+        assert [a["path"] for a in merged] == ["mta.yaml", ".github/workflows/ci.yml", "package.json"]
+        assert merged[0]["content"] == "new"
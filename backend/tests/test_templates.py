@@ -9,6 +9,8 @@ from backend.templates import (
     render_cds_schema,
     render_service_cds,
     render_manifest_json,
+    render_component_js,
+    render_i18n_properties,
     render_mta_yaml,
     render_xs_security,
 )
@@ -86,6 +88,29 @@ class TestFioriTemplates:
         
         assert manifest["sap.app"]["id"] == "com.test.app"
         assert "Customer" in str(manifest["sap.ui5"]["routing"])
+        assert manifest["sap.ui5"]["routing"]["targets"]["CustomerList"]["name"] == "sap.fe.templates.ListReport"
+
+    def test_render_manifest_json_list_template(self):
+        """Test the list page floorplan can be chosen."""
+        result = render_manifest_json(
+            app_id="com.test.app",
+            app_title="Test App",
+            service_path="/odata/v4/catalog",
+            main_entity="Sales",
+            list_template="sap.fe.templates.AnalyticalListPage",
+        )
+
+        targets = json.loads(result)["sap.ui5"]["routing"]["targets"]
+        assert targets["SalesList"]["name"] == "sap.fe.templates.AnalyticalListPage"
+
+    def test_render_component_and_i18n(self):
+        """Test rendering Component.js and i18n.properties."""
+        component = render_component_js("salesapp")
+        i18n = render_i18n_properties("Sales App", "Sales App - SAP Fiori Elements")
+
+        assert 'AppComponent.extend("salesapp.Component"' in component
+        assert "appTitle=Sales App\n" in i18n
+        assert "appDescription=Sales App - SAP Fiori Elements" in i18n
 
 
 class TestDeploymentTemplates:
@@ -140,3 +165,21 @@ class TestDeploymentTemplates:
         assert security["xsappname"] == "test-app"
         assert len(security["scopes"]) == 2
         assert len(security["role-templates"]) == 2
+
+
+class TestTemplateEngine:
+    """Tests for the template environment."""
+
+    def test_bytecode_cache_persists_compiled_templates(self, tmp_path):
+        """Test compiled templates are written to the configured directory."""
+        from unittest.mock import patch
+        from backend.templates import get_template_engine
+
+        cache_dir = tmp_path / "jinja"
+        with patch("backend.templates.get_settings") as mock_settings:
+            mock_settings.return_value.template_bytecode_cache_path = str(cache_dir)
+            env = get_template_engine.__wrapped__()
+
+        env.get_template("fiori/Component.js.j2").render(app_id="testapp")
+
+        assert any(cache_dir.iterdir())